@@ -0,0 +1,334 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Offline benchmarks for the public codec paths of erdi8.
+
+Every case is timed with timeit (best of --repeat runs over a fixed, seeded set
+of inputs) and reported in nanoseconds per operation. Results can be written
+as JSON and compared against a stored baseline; the script exits with status 1
+if a case got slower than the baseline by more than --threshold.
+
+    python benchmarks/run.py --output result.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Baselines are machine dependent, create one with --output on the machine (and
+Python version) that runs the comparison. Cases that are missing from the
+baseline fail the comparison as well unless --allow-new is given; regenerate
+the baseline when adding cases.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from erdi8 import Erdi8, Erdi8Counter  # noqa: E402
+
+# name -> number of bits of the values
+SIZES = {
+    "counter": 20,
+    "u64": 64,
+    "uuid128": 128,
+    "sha256": 256,
+    "int4kb": 4096 * 8,
+}
+BATCH_SIZES = (100, 10000)
+SEED = 8
+
+
+def _values(bits: int, count: int) -> List[int]:
+    """
+    :param bits: maximum number of bits of the values.
+    :param count: number of values.
+    :returns: seeded random values.
+    """
+    rng = random.Random(f"{SEED}-{bits}-{count}")
+    return [rng.getrandbits(bits) for _ in range(count)]
+
+
+def _cases(count: int) -> List[Tuple[str, Callable[[], Any], int]]:
+    """
+    :param count: number of inputs per single value case (large values use fewer).
+    :returns: list of (name, function, number of operations per call).
+    """
+    cases = []
+    for safe in (False, True):
+        e8 = Erdi8(safe)
+        flag = "safe" if safe else "default"
+        for size, bits in SIZES.items():
+            number = count if bits <= 256 else max(count // 50, 1)
+            ints = _values(bits, number)
+            strings = [e8.encode_int(value) for value in ints]
+            stride = _values(bits + 8, 1)[0]
+            # fancy identifiers need at least two characters
+            fancy = [value if len(value) > 1 else value + "2" for value in strings]
+            chunks = {len(value): value for value in fancy}
+            cases.extend(
+                [
+                    (
+                        f"encode_int/{size}/{flag}",
+                        lambda e8=e8, ints=ints: [e8.encode_int(i) for i in ints],
+                        number,
+                    ),
+                    (
+                        f"decode_int/{size}/{flag}",
+                        lambda e8=e8, s=strings: [e8.decode_int(i) for i in s],
+                        number,
+                    ),
+                    (
+                        f"encode_int_into/{size}/{flag}",
+                        lambda e8=e8, ints=ints, b=bytearray(8192): [
+                            e8.encode_int_into(i, b) for i in ints
+                        ],
+                        number,
+                    ),
+                    (
+                        f"decode_int_bytes/{size}/{flag}",
+                        lambda e8=e8, s=[v.encode() for v in strings]: [
+                            e8.decode_int_bytes(i) for i in s
+                        ],
+                        number,
+                    ),
+                    (
+                        f"increment/{size}/{flag}",
+                        lambda e8=e8, s=strings: [e8.increment(i) for i in s],
+                        number,
+                    ),
+                    (
+                        f"counter_next_n/{size}/{flag}",
+                        lambda e8=e8, s=strings: Erdi8Counter(e8, s[0]).next_n(len(s)),
+                        number,
+                    ),
+                    (
+                        f"increment_fancy/{size}/{flag}",
+                        lambda e8=e8, s=fancy, st=stride: [
+                            e8.increment_fancy(i, st) for i in s
+                        ],
+                        number,
+                    ),
+                    (
+                        f"split_fancy_space/{size}/{flag}",
+                        lambda e8=e8, lengths=list(chunks), st=stride: [
+                            e8.split_fancy_space(length, st, 16) for length in lengths
+                        ],
+                        len(chunks),
+                    ),
+                    (
+                        f"fancy_split_index/{size}/{flag}",
+                        lambda e8=e8, s=fancy, st=stride: [
+                            e8.fancy_split_index(i, st, 16) for i in s
+                        ],
+                        number,
+                    ),
+                ]
+            )
+        words = _values(32, count)
+        chunked = [e8.encode_four_bytes(value.to_bytes(4, "big")) for value in words]
+        packed = [value.to_bytes(4, "big") for value in words]
+        cases.extend(
+            [
+                (
+                    f"encode_four_bytes/{flag}",
+                    lambda e8=e8, p=packed: [e8.encode_four_bytes(i) for i in p],
+                    count,
+                ),
+                (
+                    f"decode_four_bytes/{flag}",
+                    lambda e8=e8, s=chunked: [e8.decode_four_bytes(i) for i in s],
+                    count,
+                ),
+            ]
+        )
+        uuids = [uuid.UUID(int=value) for value in _values(128, count)]
+        encoded = e8.encode_uuids(uuids)
+        digests = [value.to_bytes(32, "big") for value in _values(256, count)]
+        encoded_digests = e8.encode_digests(digests)
+        cases.extend(
+            [
+                (
+                    f"encode_uuid/{flag}",
+                    lambda e8=e8, u=uuids: [e8.encode_uuid(i) for i in u],
+                    count,
+                ),
+                (
+                    f"decode_uuid/{flag}",
+                    lambda e8=e8, s=encoded: [e8.decode_uuid(i) for i in s],
+                    count,
+                ),
+                (
+                    f"encode_digest/sha256/{flag}",
+                    lambda e8=e8, d=digests: [e8.encode_digest(i) for i in d],
+                    count,
+                ),
+                (
+                    f"decode_digest/sha256/{flag}",
+                    lambda e8=e8, s=encoded_digests: [e8.decode_digest(i, 32) for i in s],
+                    count,
+                ),
+            ]
+        )
+        for batch in BATCH_SIZES:
+            ints = _values(64, batch)
+            strings = e8.encode_many(ints)
+            cases.extend(
+                [
+                    (
+                        f"encode_many/{batch}/{flag}",
+                        lambda e8=e8, ints=ints: e8.encode_many(ints),
+                        batch,
+                    ),
+                    (
+                        f"decode_many/{batch}/{flag}",
+                        lambda e8=e8, s=strings: e8.decode_many(s),
+                        batch,
+                    ),
+                    (
+                        f"validate_many/{batch}/{flag}",
+                        lambda e8=e8, s=strings: e8.validate_many(s),
+                        batch,
+                    ),
+                ]
+            )
+    return cases
+
+
+def run(
+    count: int = 1000, repeat: int = 5, min_time: float = 0.05, match: str = ""
+) -> Dict[str, float]:
+    """
+    Runs the benchmarks.
+
+    :param count: number of inputs per single value case.
+    :param repeat: number of timing runs per case, the best one is reported.
+    :param min_time: minimum duration of a timing run in seconds.
+    :param match: only run cases whose name contains this string.
+    :returns: nanoseconds per operation by case name.
+    """
+    results = {}
+    for name, function, number in _cases(count):
+        if match not in name:
+            continue
+        timer = timeit.Timer(function)
+        calls = 1
+        while True:
+            elapsed = timer.timeit(calls)
+            if elapsed >= min_time:
+                break
+            calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)) + 1)
+        best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=calls))
+        results[name] = best / (calls * number) * 1e9
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> Tuple[List[str], List[str]]:
+    """
+    :param results: nanoseconds per operation by case name.
+    :param baseline: nanoseconds per operation by case name of the baseline.
+    :param threshold: allowed relative slowdown, e.g. 0.25 for 25%.
+    :returns: names of the cases that regressed and names of the cases that are not
+    in the baseline.
+    """
+    regressions = []
+    missing = []
+    for name in sorted(results):
+        if name not in baseline:
+            missing.append(name)
+            print(f"{name:40} {'-':>14} {results[name]:14.1f} {'-':>7} NOT IN BASELINE")
+            continue
+        ratio = results[name] / baseline[name]
+        if ratio > 1 + threshold:
+            regressions.append(name)
+        print(
+            f"{name:40} {baseline[name]:14.1f} {results[name]:14.1f} {ratio:7.2f}"
+            + (" REGRESSION" if ratio > 1 + threshold else "")
+        )
+    return regressions, missing
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1000, help="inputs per case")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="minimum seconds per timing run"
+    )
+    parser.add_argument("--match", default="", help="only run cases containing this")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON file to compare the results with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown against the baseline (default: 0.25)",
+    )
+    parser.add_argument(
+        "--allow-new",
+        action="store_true",
+        help="don't fail on cases that are missing from the baseline",
+    )
+    args = parser.parse_args(argv)
+    results = run(args.count, args.repeat, args.min_time, args.match)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "count": args.count,
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+    if not args.baseline:
+        for name, value in results.items():
+            print(f"{name:40} {value:14.1f} ns/op")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    print(f"{'case':40} {'baseline ns':>14} {'current ns':>14} {'ratio':>7}")
+    regressions, missing = compare(results, baseline, args.threshold)
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) slower than the baseline by more than "
+            f"{args.threshold:.0%}.",
+            file=sys.stderr,
+        )
+    if missing:
+        print(
+            f"{len(missing)} case(s) not in the baseline"
+            + (", regenerate it with --output." if not args.allow_new else "."),
+            file=sys.stderr,
+        )
+    return 1 if regressions or (missing and not args.allow_new) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,3 @@
 from erdi8.erdi8 import Erdi8
+from erdi8.counter import Erdi8Counter
+from erdi8.fancy import Capacity, FancySequence, FancyView, ShardRouter, StridePlanner
@@ -0,0 +1,23 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+
+from erdi8.cli import main
+
+sys.exit(main())
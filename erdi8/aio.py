@@ -0,0 +1,220 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+asyncio front end for the erdi8 sequences. An AsyncSequence keeps a bounded
+buffer of identifiers that a background task refills in batches, so handing out
+an identifier is a pop from a deque. When consumers stall, the buffer fills up
+and the background task waits instead of computing (or reserving) more.
+
+    async with AsyncSequence(FancySequence(e8, "b222222222", stride)) as ids:
+        value = await ids.next()
+        async for value in ids:
+            ...
+"""
+
+import asyncio
+import collections
+import itertools
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Iterator, List, Optional
+
+from erdi8.erdi8 import Erdi8
+from erdi8.fancy import FancySequence, ShardRouter
+
+
+class AsyncSequence(AsyncIterator[str]):
+    """
+    Async iterator over the values of a sequence (FancySequence, PersistentCounter or
+    any iterator of erdi8 values) with background prefetch. Only use it from one
+    event loop; the source must not be used by anything else meanwhile.
+    """
+
+    def __init__(
+        self,
+        source: Iterator[str],
+        batch_size: int = 1000,
+        buffer_size: Optional[int] = None,
+        reserve: Optional[Callable[[List[str]], Awaitable[Any]]] = None,
+        limit: Optional[int] = None,
+        executor: Any = None,
+    ):
+        """
+        AsyncSequence Constructor.
+
+        :param source: the sequence, its next_n method is used if it has one.
+        :param batch_size: number of values computed (and reserved) at a time.
+        :param buffer_size: maximum number of buffered values, default: 4 * batch_size.
+        :param reserve: coroutine function that is awaited with every batch before
+        its values are handed out, e.g. to persist a high-water mark. If it raises,
+        the error is raised to the consumers.
+        :param limit: maximum number of values, the iteration stops after them.
+        :param executor: concurrent.futures executor to compute the batches in,
+        default: compute them in the event loop (between requests).
+        """
+        buffer_size = 4 * batch_size if buffer_size is None else buffer_size
+        if batch_size < 1 or buffer_size < batch_size:
+            raise ValueError(
+                f"Error: batch_size must be positive and buffer_size at least batch_size. "
+                f"You provided {batch_size} and {buffer_size}."
+            )
+        self.source = source
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.reserve = reserve
+        self.limit = limit
+        self.executor = executor
+        self._buffer: Deque[str] = collections.deque()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._error: Optional[Exception] = None
+        self._done = False
+
+    @classmethod
+    def chunks(
+        cls, e8: Erdi8, length: int, stride: int, number_chunks: int, **kwargs: Any
+    ) -> List["AsyncSequence"]:
+        """
+        One AsyncSequence per chunk of a fancy sequence (see Erdi8.split_fancy_space
+        and ShardRouter). Each one starts after the start value of its chunk and
+        stops at the end of the chunk.
+
+        :param e8: the Erdi8 object to encode with.
+        :param length: the length of the erdi8 identifiers
+        :param stride: a int denoting the stride
+        :param number_chunks: number of chunks to split the space into
+        :param kwargs: further arguments of the constructor.
+        :returns: list of AsyncSequence objects in the order of the chunks.
+        """
+        router = ShardRouter(e8, length, stride, number_chunks)
+        return [
+            cls(FancySequence(e8, start, stride), limit=size - 1, **kwargs)
+            for start, size in zip(router.starts(), router.sizes())
+        ]
+
+    @property
+    def buffered(self) -> int:
+        """
+        Number of values that can be handed out right away.
+        """
+        return len(self._buffer)
+
+    def _produce(self, number: int) -> List[str]:
+        next_n = getattr(self.source, "next_n", None)
+        if next_n is not None:
+            return next_n(number)
+        return list(itertools.islice(self.source, number))
+
+    def _start(self) -> None:
+        if self._task is None:
+            self._ready = asyncio.Event()
+            self._space = asyncio.Event()
+            self._task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self) -> None:
+        """
+        Background task: computes and reserves batches while there is room in the buffer.
+        """
+        assert self._ready is not None and self._space is not None
+        loop = asyncio.get_running_loop()
+        left = self.limit
+        try:
+            while left is None or left > 0:
+                while len(self._buffer) + self.batch_size > self.buffer_size:
+                    self._space.clear()
+                    await self._space.wait()
+                number = self.batch_size if left is None else min(self.batch_size, left)
+                if self.executor is None:
+                    batch = self._produce(number)
+                else:
+                    batch = await loop.run_in_executor(self.executor, self._produce, number)
+                if not batch:
+                    break
+                if self.reserve is not None:
+                    await self.reserve(batch)
+                self._buffer.extend(batch)
+                self._ready.set()
+                if left is not None:
+                    left = left - len(batch)
+                # give the consumers a turn between batches
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._error = error
+        finally:
+            self._done = True
+            self._ready.set()
+
+    async def next(self) -> str:
+        """
+        :returns: the next value, waits for the background task if the buffer is empty.
+        """
+        while not self._buffer:
+            if self._error is not None:
+                raise self._error
+            if self._done:
+                raise StopAsyncIteration
+            self._start()
+            assert self._ready is not None
+            self._ready.clear()
+            await self._ready.wait()
+        value = self._buffer.popleft()
+        if self._space is not None and len(self._buffer) + self.batch_size <= self.buffer_size:
+            self._space.set()
+        return value
+
+    async def next_n(self, number: int) -> List[str]:
+        """
+        :param number: how many values to get.
+        :returns: list of the next values, shorter than number if the sequence ends.
+        """
+        result = []
+        try:
+            for _ in range(number):
+                result.append(await self.next())
+        except StopAsyncIteration:
+            pass
+        return result
+
+    def __aiter__(self) -> "AsyncSequence":
+        return self
+
+    async def __anext__(self) -> str:
+        return await self.next()
+
+    async def aclose(self) -> None:
+        """
+        Stops the background task. Buffered values are discarded.
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._done = True
+        self._buffer.clear()
+
+    async def __aenter__(self) -> "AsyncSequence":
+        # start filling the buffer before the first value is requested
+        self._start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,288 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Identifier allocation that is safe across threads and processes of one host.
+Workers lease blocks of consecutive identifiers (consecutive in terms of
+Erdi8.increment or Erdi8.increment_fancy) and serve them locally, the shared
+state is only touched once per block.
+"""
+
+import multiprocessing
+import os
+from typing import Any, Iterator, List, Optional, TypedDict
+
+from erdi8.erdi8 import Erdi8
+
+# slot owner values besides process ids
+FREE = 0
+RETURNED = -1
+# shared state layout: next offset, number of abandoned ids, then one slot
+# (owner, start, end) per lease
+HEADER = 2
+SLOT = 3
+
+
+class AbandonedLease(TypedDict):
+    """
+    A lease of a process that died before returning it. Some of the identifiers
+    between first and last (inclusive) may have been handed out.
+    """
+
+    pid: int
+    first: str
+    last: str
+    count: int
+
+
+class AllocatorStats(TypedDict):
+    """
+    Custom type for the allocator bookkeeping, all values are numbers of identifiers.
+    """
+
+    reserved: int
+    leased: int
+    returned: int
+    abandoned: int
+
+
+class Lease(Iterator[str]):
+    """
+    A block of identifiers leased by one worker. A lease is not meant to be shared
+    between threads; return it with release (or use it as a context manager) so
+    that unused identifiers can be handed out again.
+    """
+
+    def __init__(self, allocator: "BlockAllocator", slot: int, start: int, end: int):
+        self.allocator = allocator
+        self.slot = slot
+        self.position = start
+        self.end = end
+
+    def __iter__(self) -> "Lease":
+        return self
+
+    def __next__(self) -> str:
+        if self.position >= self.end:
+            raise StopIteration
+        value = self.allocator.render(self.position)
+        self.position = self.position + 1
+        return value
+
+    def __len__(self) -> int:
+        return max(self.end - self.position, 0)
+
+    def __enter__(self) -> "Lease":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.release()
+
+    def release(self) -> None:
+        """
+        Returns the unused rest of the block to the allocator.
+        """
+        if self.slot < 0:
+            return
+        self.allocator._release(self.slot, self.position, self.end)
+        self.slot = -1
+        self.end = self.position
+
+
+class BlockAllocator:
+    """
+    Hands out identifiers in blocks. Create it once and pass it to threads or - as
+    argument of multiprocessing.Process or a Pool initializer - to worker processes.
+    """
+
+    def __init__(
+        self,
+        e8: Erdi8,
+        current: Optional[str] = None,
+        stride: Optional[int] = None,
+        block_size: int = 1000,
+        max_leases: int = 64,
+        context: Any = None,
+    ):
+        """
+        BlockAllocator Constructor.
+
+        :param e8: the Erdi8 object to encode with.
+        :param current: current erdi8 value, the first identifier handed out is the one after it.
+        :param stride: a int denoting the stride. If set, identifiers follow increment_fancy
+        (current is required then), otherwise increment.
+        :param block_size: number of identifiers per lease.
+        :param max_leases: number of leases that can be held or returned at the same time.
+        :param context: multiprocessing context, defaults to multiprocessing.get_context().
+        """
+        if block_size < 1:
+            raise ValueError(f"Error: block_size must be positive. You provided {block_size}.")
+        context = context or multiprocessing.get_context()
+        self.e8 = e8
+        self.block_size = block_size
+        self.max_leases = max_leases
+        if stride is None:
+            self.capacity = None
+            self.base = e8.decode_int(current) if current else -1
+        else:
+            if not current:
+                raise ValueError("Error: A fancy allocator needs a current value.")
+            e8.check(current)
+            self.mini, _, self.space = e8.mod_space(len(current))
+            self.stride = e8.effective_stride(self.mini, self.space, stride)
+            self.step = (self.mini + self.stride) % self.space
+            self.base = e8.decode_int(current) - self.mini
+            # the current value itself is the only one that can't be handed out
+            self.capacity = self.space - 1
+        self._lock = context.Lock()
+        self._state = context.RawArray("q", HEADER + SLOT * max_leases)
+
+    def render(self, offset: int) -> str:
+        """
+        The identifier at a given offset, offset 0 is the one after current.
+
+        :param offset: the offset.
+        :returns: erdi8 value
+        """
+        if self.capacity is None:
+            return self.e8.encode_int(self.base + offset + 1)
+        return self.e8.encode_int(
+            self.mini + (self.base + (offset + 1) * self.step) % self.space
+        )
+
+    def lease(self) -> Lease:
+        """
+        Leases a block of identifiers. Returned rests of earlier leases are handed out
+        first, otherwise a fresh block of block_size identifiers is reserved.
+
+        :returns: the lease
+        """
+        state = self._state
+        with self._lock:
+            free = -1
+            for slot in range(self.max_leases):
+                i = HEADER + SLOT * slot
+                if state[i] == RETURNED:
+                    state[i] = os.getpid()
+                    return Lease(self, slot, state[i + 1], state[i + 2])
+                if state[i] == FREE and free < 0:
+                    free = slot
+            if free < 0:
+                raise ValueError(
+                    f"Error: All {self.max_leases} leases are in use, increase max_leases."
+                )
+            start = state[0]
+            end = start + self.block_size
+            if self.capacity is not None:
+                end = min(end, self.capacity)
+            if start >= end:
+                raise ValueError("Error: The mod space is exhausted.")
+            state[0] = end
+            i = HEADER + SLOT * free
+            state[i], state[i + 1], state[i + 2] = os.getpid(), start, end
+            return Lease(self, free, start, end)
+
+    def _release(self, slot: int, position: int, end: int) -> None:
+        state = self._state
+        i = HEADER + SLOT * slot
+        with self._lock:
+            if position < end:
+                state[i], state[i + 1] = RETURNED, position
+            else:
+                state[i] = FREE
+
+    def ids(self) -> Iterator[str]:
+        """
+        Endless stream of identifiers for one worker, leasing new blocks as needed. In
+        fancy mode it raises a ValueError once the mod space is exhausted.
+
+        :returns: iterator over erdi8 values
+        """
+        while True:
+            with self.lease() as lease:
+                yield from lease
+
+    def reclaim(self) -> List[AbandonedLease]:
+        """
+        Finds leases of processes that are no longer alive (i.e. exited and joined).
+        Their identifiers are not handed out again (the process may have used some of
+        them) but they are counted as abandoned and reported.
+
+        :returns: the abandoned leases
+        """
+        state = self._state
+        result: List[AbandonedLease] = []
+        with self._lock:
+            for slot in range(self.max_leases):
+                i = HEADER + SLOT * slot
+                pid = state[i]
+                if pid > 0 and not _alive(pid):
+                    count = state[i + 2] - state[i + 1]
+                    result.append(
+                        {
+                            "pid": pid,
+                            "first": self.render(state[i + 1]),
+                            "last": self.render(state[i + 2] - 1),
+                            "count": count,
+                        }
+                    )
+                    state[1] = state[1] + count
+                    state[i] = FREE
+        return result
+
+    def stats(self) -> AllocatorStats:
+        """
+        Bookkeeping of the allocator: identifiers reserved in total, currently leased,
+        returned (waiting to be handed out again), and abandoned by dead processes.
+
+        :returns: the numbers of identifiers
+        """
+        state = self._state
+        leased = returned = 0
+        with self._lock:
+            for slot in range(self.max_leases):
+                i = HEADER + SLOT * slot
+                if state[i] > 0:
+                    leased = leased + state[i + 2] - state[i + 1]
+                elif state[i] == RETURNED:
+                    returned = returned + state[i + 2] - state[i + 1]
+            return {
+                "reserved": state[0],
+                "leased": leased,
+                "returned": returned,
+                "abandoned": state[1],
+            }
+
+
+def _alive(pid: int) -> bool:
+    """
+    Note that processes that have exited but were not joined yet still count as alive.
+    On Windows os.kill can't be used for probing, all processes count as alive.
+
+    :param pid: a process id.
+    :returns: whether a process with this id exists.
+    """
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,341 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Command line bulk converter. Reads newline-delimited values (or one column of a
+CSV file) from files or stdin and writes the converted values to stdout. Input
+is processed in blocks of lines, so memory use does not depend on the input size.
+
+    $ seq 0 5 | erdi8 encode
+    $ erdi8 decode --csv --column id --header ids.csv
+    $ erdi8 fancy b222222222 30321718760514 --count 1000000 --safe
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from erdi8.erdi8 import Erdi8
+from erdi8.fancy import FancySequence
+
+BLOCK_LINES = 1 << 16
+BUFFER_SIZE = 1 << 20
+DECIMAL = re.compile("[0-9]+")
+HEX = re.compile("[0-9a-fA-F]+")
+UUID = re.compile("[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+class Invalid(Exception):
+    """
+    Raised for the first invalid input value, carries the line number.
+    """
+
+    def __init__(self, line: int, error: ValueError):
+        super().__init__(f"line {line}: {error}")
+
+
+def _int(value: str) -> int:
+    """
+    :param value: decimal string.
+    :returns: the integer.
+    """
+    # int() would also accept a sign, underscores and whitespace
+    if not DECIMAL.fullmatch(value):
+        raise ValueError(f"Error: {value!r} is not a decimal integer.")
+    return int(value)
+
+
+def _decode(e8: Erdi8, values: List[str], width: Optional[int]) -> List[str]:
+    """
+    :param e8: the Erdi8 object.
+    :param values: erdi8 values.
+    :param width: optional fixed width.
+    :returns: the decoded integers as strings.
+    """
+    try:
+        return [str(v) for v in e8.decode_many(values, width=width)]
+    except UnicodeEncodeError:
+        # NumPy can't convert non-ASCII strings, report them like check does
+        for value in values:
+            error = e8.check_error(value)
+            if error is not None:
+                raise error
+        raise
+
+
+def _hex(value: str) -> int:
+    """
+    :param value: hex string, optionally with 0x prefix, or a UUID with dashes.
+    :returns: the integer.
+    """
+    value = value.strip()
+    if UUID.fullmatch(value):
+        value = value.replace("-", "")
+    elif value[:2] in ("0x", "0X"):
+        value = value[2:]
+    # int() would also accept a sign, underscores and inner whitespace
+    if not HEX.fullmatch(value):
+        raise ValueError(f"Error: {value!r} is not a hex string.")
+    return int(value, 16)
+
+
+def _converter(args: argparse.Namespace, e8: Erdi8) -> Callable[[List[str]], List[str]]:
+    """
+    :param args: parsed arguments.
+    :param e8: the Erdi8 object.
+    :returns: function that converts a block of values.
+    """
+    if args.command == "encode":
+        return lambda values: e8.encode_many([_int(v) for v in values], width=args.width)
+    if args.command == "decode":
+        return lambda values: _decode(e8, values, args.width)
+    if args.command == "hex":
+        return lambda values: e8.encode_many([_hex(v) for v in values], width=args.width)
+    return lambda values: values
+
+
+def _convert(
+    convert: Callable[[List[str]], List[str]], values: List[str], lines: Iterable[int]
+) -> List[str]:
+    """
+    Converts a block, finds the line of the first invalid value if that fails.
+
+    :param convert: block converter.
+    :param values: the values of the block.
+    :param lines: the line numbers of the values.
+    :returns: the converted values.
+    """
+    try:
+        return convert(values)
+    except ValueError:
+        for line, value in zip(lines, values):
+            try:
+                convert([value])
+            except ValueError as error:
+                raise Invalid(line, error)
+        raise
+
+
+def _open(paths: List[str]) -> Iterator[TextIO]:
+    """
+    :param paths: input paths, "-" (or none) for stdin.
+    :returns: iterator over the opened files.
+    """
+    for path in paths or ["-"]:
+        if path == "-":
+            yield sys.stdin
+        else:
+            with open(path, newline="", buffering=BUFFER_SIZE) as f:
+                yield f
+
+
+def _lines(args: argparse.Namespace, e8: Erdi8, out: TextIO) -> Tuple[int, int]:
+    """
+    Converts newline-delimited input.
+
+    :returns: number of processed values and number of invalid values (check only).
+    """
+    convert = _converter(args, e8)
+    count = invalid = 0
+    for f in _open(args.files):
+        stripped = (line.rstrip("\r\n") for line in f)
+        while True:
+            block = list(itertools.islice(stripped, args.block_lines))
+            if not block:
+                break
+            if args.command == "check":
+                invalid = invalid + _check(e8, block, count, out)
+            else:
+                # empty lines are passed through
+                lines = [i for i, line in enumerate(block, count + 1) if line.strip()]
+                values = [block[i - count - 1].strip() for i in lines]
+                result = iter(_convert(convert, values, lines))
+                out.write("".join(next(result) + "\n" if line.strip() else "\n" for line in block))
+            count = count + len(block)
+    return count, invalid
+
+
+def _check(e8: Erdi8, values: List[str], offset: int, out: TextIO) -> int:
+    """
+    Reports the invalid values of a block as "line<TAB>value<TAB>error".
+
+    :param e8: the Erdi8 object.
+    :param values: the values of the block.
+    :param offset: number of values before the block.
+    :param out: output stream.
+    :returns: number of invalid values.
+    """
+    invalid = e8.invalid_indices(values)
+    for i in invalid:
+        out.write(f"{offset + i + 1}\t{values[i]}\t{e8.check_error(values[i])}\n")
+    return len(invalid)
+
+
+def _csv(args: argparse.Namespace, e8: Erdi8, out: TextIO) -> Tuple[int, int]:
+    """
+    Converts one column of CSV input, all other columns are copied.
+
+    :returns: number of processed values and number of invalid values (check only).
+    """
+    convert = _converter(args, e8)
+    writer = csv.writer(out, delimiter=args.delimiter, lineterminator="\n")
+    count = invalid = line = 0
+    for f in _open(args.files):
+        reader = csv.reader(f, delimiter=args.delimiter)
+        column = args.column
+        if args.header:
+            header = next(reader, None)
+            if header is None:
+                continue
+            if args.command != "check":
+                writer.writerow(header)
+            # records are numbered like lines, starting with the header
+            line = line + 1
+            if not column.isdigit():
+                if column not in header:
+                    raise ValueError(f"Error: Column {column!r} not found in {header}.")
+                column = str(header.index(column))
+        index = int(column)
+        while True:
+            rows = list(itertools.islice(reader, args.block_lines))
+            if not rows:
+                break
+            try:
+                values = [row[index] for row in rows]
+            except IndexError:
+                number = next(i for i, row in enumerate(rows) if len(row) <= index)
+                raise Invalid(
+                    line + number + 1, ValueError(f"Error: The record has no column {index}.")
+                )
+            if args.command == "check":
+                invalid = invalid + _check(e8, values, line, out)
+            else:
+                lines = range(line + 1, line + len(rows) + 1)
+                for row, value in zip(rows, _convert(convert, values, lines)):
+                    row[index] = value
+                writer.writerows(rows)
+            count = count + len(rows)
+            line = line + len(rows)
+    return count, invalid
+
+
+def _fancy(args: argparse.Namespace, e8: Erdi8, out: TextIO) -> Tuple[int, int]:
+    """
+    Writes the next count values of a fancy sequence.
+
+    :returns: number of generated values and 0.
+    """
+    sequence = FancySequence(e8, args.start, args.stride)
+    if args.count > sequence.space:
+        raise ValueError(
+            f"Error: The mod space of length {sequence.length} only has {sequence.space} values."
+        )
+    left = args.count
+    while left > 0:
+        number = min(left, args.block_lines)
+        out.write("\n".join(sequence.next_n(number)) + "\n")
+        left = left - number
+    return args.count, 0
+
+
+def parser() -> argparse.ArgumentParser:
+    """
+    :returns: the argument parser of the command line interface.
+    """
+    result = argparse.ArgumentParser(prog="erdi8", description=__doc__.split("\n\n")[1])
+    commands = result.add_subparsers(dest="command", required=True)
+    helps = {
+        "encode": "integers to erdi8",
+        "decode": "erdi8 to integers",
+        "hex": "hex strings or UUIDs to erdi8",
+        "check": "report invalid erdi8 values (line, value, error)",
+    }
+    for name, text in helps.items():
+        command = commands.add_parser(name, help=text, description=text)
+        command.add_argument("files", nargs="*", help="input files, default: stdin")
+        command.add_argument("--csv", action="store_true", help="input is CSV")
+        command.add_argument("--column", default="0", help="CSV column index or name")
+        command.add_argument("--header", action="store_true", help="CSV has a header row")
+        command.add_argument("--delimiter", default=",", help="CSV delimiter")
+        if name != "check":
+            command.add_argument("--width", type=int, help="fixed width (see encode_int)")
+    fancy = commands.add_parser(
+        "fancy", help="generate a fancy sequence", description="generate a fancy sequence"
+    )
+    fancy.add_argument("start", help="current value, the first one written is the one after it")
+    fancy.add_argument("stride", type=int, help="stride")
+    fancy.add_argument("--count", type=int, required=True, help="number of values")
+    for command in commands.choices.values():
+        command.add_argument("--safe", action="store_true", help="use Erdi8(safe=True)")
+        command.add_argument(
+            "--block-lines", type=int, default=BLOCK_LINES, help="lines processed at a time"
+        )
+        command.add_argument(
+            "-q", "--quiet", action="store_true", help="don't report throughput on stderr"
+        )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the erdi8 command.
+
+    :param argv: arguments, default: sys.argv[1:].
+    :returns: exit status (0: success, 1: invalid input or closed output).
+    """
+    args = parser().parse_args(argv)
+    e8 = Erdi8.get(args.safe)
+    out: Any = sys.stdout
+    start = time.perf_counter()
+    try:
+        if args.command == "fancy":
+            count, invalid = _fancy(args, e8, out)
+        elif args.csv:
+            count, invalid = _csv(args, e8, out)
+        else:
+            count, invalid = _lines(args, e8, out)
+        out.flush()
+    except BrokenPipeError:
+        # the reader went away (e.g. "| head"), stop quietly like other filters;
+        # stdout points to devnull so that flushing it at exit doesn't fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 1
+    except UnicodeError as error:
+        # e.g. input that isn't valid in the encoding of stdin
+        out.flush()
+        print(f"erdi8: Error: {error}", file=sys.stderr)
+        return 1
+    except (Invalid, ValueError) as error:
+        out.flush()
+        print(f"erdi8: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(
+            f"erdi8: {count} values in {elapsed:.3f} s "
+            f"({count / max(elapsed, 1e-9):,.0f} values/s)",
+            file=sys.stderr,
+        )
+    return 1 if invalid else 0
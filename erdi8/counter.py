@@ -0,0 +1,140 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A mutable counter for plain (increment) erdi8 sequences. The digits are kept as
+alphabet indices in a bytearray in the order of the characters, so an increment
+changes a few bytes at the end in place and rendering is a single translate.
+"""
+
+from typing import Iterator, List, Optional
+
+from erdi8.erdi8 import Erdi8
+
+
+class Erdi8Counter(Iterator[str]):
+    """
+    In-place counter that produces the same values as calling Erdi8.increment in a
+    loop. The value is only rendered to str (or bytes) when it is asked for.
+    """
+
+    def __init__(self, e8: Erdi8, current: Optional[str] = None):
+        """
+        Erdi8Counter Constructor.
+
+        :param e8: the Erdi8 object to encode with.
+        :param current: current erdi8 value, the first generated value is the one after it.
+        """
+        self.e8 = e8
+        self.digits = bytearray()
+        # map the characters to their alphabet indices and back
+        self.indices = bytes.maketrans(e8.alph_bytes, bytes(range(e8.alph_len)))
+        self.table = bytes.maketrans(bytes(range(e8.alph_len)), e8.alph_bytes)
+        # rendering of all characters but the last one, None if it has to be rebuilt
+        self._head: Optional[str] = None
+        self._set(current or "")
+
+    def _set(self, value: str) -> None:
+        """
+        :param value: erdi8 value to set the counter to.
+        """
+        self.e8.check(value)
+        self.digits[:] = value.encode("ascii").translate(self.indices)
+        self._head = None
+
+    def increment(self) -> None:
+        """
+        Advances the counter by one value. The carry runs over the trailing last
+        characters of the alphabet, which is less than one digit on average.
+        """
+        digits = self.digits
+        last = self.e8.alph_len - 1
+        i = len(digits) - 1
+        if i >= 0 and digits[i] != last:
+            digits[i] = digits[i] + 1
+            return
+        self._head = None
+        while i >= 0 and digits[i] == last:
+            digits[i] = 0
+            i = i - 1
+        if i < 0:
+            # all characters wrapped around (or the counter is empty), this happens
+            # once per length, so the insert is amortized O(1)
+            digits.insert(0, self.e8.OFFSET)
+        else:
+            digits[i] = digits[i] + 1
+
+    def advance(self, number: int) -> None:
+        """
+        Advances the counter by number values, like number calls of increment.
+
+        :param number: how many values to skip, must not be negative.
+        """
+        if number < 0:
+            raise ValueError(f"Error: Can't advance by a negative number {number}.")
+        if number == 1:
+            self.increment()
+        elif number:
+            self._set(self.e8.encode_int(int(self) + number))
+
+    def __iter__(self) -> "Erdi8Counter":
+        return self
+
+    def __next__(self) -> str:
+        self.increment()
+        return str(self)
+
+    def next_n(self, number: int) -> List[str]:
+        """
+        Generates the next number values of the sequence.
+
+        :param number: how many values to generate
+        :returns: list of the next erdi8 values
+        """
+        result = []
+        for _ in range(number):
+            self.increment()
+            result.append(str(self))
+        return result
+
+    @property
+    def current(self) -> str:
+        """
+        The last generated (or the initial) erdi8 value.
+        """
+        return str(self)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.digits).translate(self.table)
+
+    def __str__(self) -> str:
+        if not self.digits:
+            return ""
+        if self._head is None:
+            self._head = bytes(self.digits[:-1]).translate(self.table).decode("ascii")
+        return self._head + self.e8.alph[self.digits[-1]]
+
+    def __int__(self) -> int:
+        # decode_int maps the empty value to -1, the value before the first one
+        return self.e8.decode_int_bytes(bytes(self))
+
+    def __len__(self) -> int:
+        return len(self.digits)
+
+    def __repr__(self) -> str:
+        return f"Erdi8Counter({self.e8!r}, {str(self)!r})"
@@ -34,8 +34,169 @@ consecutive counting and is therefore free of collisions. In particular, it is n
 method to create secret identifiers.
 """
 
+import bisect
+import functools
 import math
-from typing import TypedDict, List, Optional, Tuple
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, TypedDict, List, Optional, Tuple, Union, cast
+
+if TYPE_CHECKING:
+    # uuid (with platform and re) is imported on first use, it doubles the import time
+    import uuid
+
+
+def _numpy() -> Any:
+    """
+    NumPy is an optional dependency that is only used for the batch methods. It
+    is imported lazily so that plain usage of erdi8 doesn't pay for it.
+
+    :returns: the numpy module or None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=64)
+def _power(base: int, exponent: int) -> int:
+    """
+    Cached powers of the alphabet length at which the divide and conquer codec for
+    large integers splits. These are LEAF_DIGITS times a power of two, so only a
+    handful of them exist up to any realistic length.
+
+    :param base: the alphabet length.
+    :param exponent: the exponent.
+    :returns: base to the power of exponent.
+    """
+    return int(base**exponent)
+
+
+@functools.lru_cache(maxsize=None)
+def _digit_blocks(alph: str) -> Tuple[str, ...]:
+    """
+    All three character digit blocks of an alphabet, ordered by their value. They are
+    built once per alphabet and shared by all Erdi8 objects (and erdi8.stream).
+
+    :param alph: the alphabet.
+    :returns: tuple of len(alph)**3 strings.
+    """
+    return tuple(a + b + c for a in alph for b in alph for c in alph)
+
+
+def _prime_factors(number: int) -> Tuple[int, ...]:
+    """
+    :param number: a (small) positive integer.
+    :returns: the distinct prime factors in ascending order.
+    """
+    result = []
+    factor = 2
+    while factor * factor <= number:
+        if number % factor == 0:
+            result.append(factor)
+            while number % factor == 0:
+                number = number // factor
+        factor = factor + 1
+    if number > 1:
+        result.append(number)
+    return tuple(result)
+
+
+@functools.lru_cache(maxsize=None)
+def _coprime_gaps(primes: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Whether an integer is coprime to a mod space only depends on its remainder
+    modulo the product of the prime factors of the space size. For every remainder
+    this table holds the distance to the next remainder that is coprime.
+
+    :param primes: the distinct prime factors of the space size.
+    :returns: tuple with one distance per remainder modulo the product of the primes.
+    """
+    modulus = math.prod(primes) if primes else 1
+    coprime = [all(r % p for p in primes) for r in range(modulus)]
+    gaps = [0] * modulus
+    gap = 0
+    # the table wraps around, start after a coprime remainder (1 always is)
+    for r in range(modulus, 0, -1):
+        r = r % modulus
+        gap = 0 if coprime[r] else gap + 1
+        gaps[r] = gap
+    return tuple(gaps)
+
+
+@functools.lru_cache(maxsize=None)
+def _fixed_width(alph_len: int, offset: int, size: int) -> int:
+    """
+    See Erdi8.fixed_width.
+
+    :param alph_len: the alphabet length.
+    :param offset: the offset of the first character.
+    :param size: number of bytes.
+    :returns: the smallest width whose mod space has at least 256**size values.
+    """
+    width = 1
+    while (alph_len - offset) * alph_len ** (width - 1) < 1 << (8 * size):
+        width = width + 1
+    return width
+
+
+@functools.lru_cache(maxsize=None)
+def _tables(
+    alphabet: str, unsafe: str, offset: int, large_bits: int, safe: bool
+) -> Dict[str, Any]:
+    """
+    The lookup tables of an Erdi8 configuration. They are built once per configuration
+    and shared by all Erdi8 objects, none of them must be modified.
+
+    :param alphabet: the alphabet (Erdi8.ALPHABET).
+    :param unsafe: characters that are removed with safe=True (Erdi8.UNSAFE).
+    :param offset: Erdi8.OFFSET.
+    :param large_bits: Erdi8.LARGE_BITS.
+    :param safe: the safe parameter.
+    :returns: the attribute values of the Erdi8 object by name.
+    """
+    alph = "".join([a for a in alphabet if a not in unsafe]) if safe else alphabet
+    alph_len = len(alph)
+    minis = tuple(
+        (alph_len - offset) * (alph_len ** (length - 1) - 1) // (alph_len - 1)
+        for length in range(1, int(large_bits / math.log2(alph_len)) + 3)
+    )
+    return {
+        "alph": alph,
+        "alph_map": {a: i for i, a in enumerate(alph)},
+        "alph_len": alph_len,
+        # maps the alphabet to the digits int() understands for base alph_len
+        "digit_table": str.maketrans(
+            alph, "0123456789abcdefghijklmnopqrstuvwxyz"[:alph_len]
+        ),
+        # the min values of the mod spaces (see mod_space) up to LARGE_BITS are
+        # looked up instead of computed
+        "minis": minis,
+        "powers": tuple(alph_len**exponent for exponent in range(len(minis))),
+        # decode_int reads all digits at once with int(), this is the correction for
+        # the first digit (that includes the OFFSET) plus the min value of the mod space
+        "decode_bias": tuple(
+            mini - offset * alph_len ** (length - 1) for length, mini in enumerate(minis, 1)
+        ),
+        # translate tables that delete all valid characters
+        "invalid_chars": str.maketrans("", "", alph),
+        "leading_digits": alph[:offset],
+        "alph_bytes": alph.encode("ascii"),
+        # the same tables for the bytes API: digits for int() and the successor of
+        # every character for increment_bytes
+        "digit_bytes": bytes.maketrans(
+            alph.encode("ascii"), b"0123456789abcdefghijklmnopqrstuvwxyz"[:alph_len]
+        ),
+        "next_bytes": bytes.maketrans(
+            alph.encode("ascii"), (alph[1:] + alph[:1]).encode("ascii")
+        ),
+        "leading_bytes": alph[:offset].encode("ascii"),
+        # every mod space size is (alph_len - OFFSET) * alph_len**(length - 1)
+        "stride_primes": tuple(
+            sorted(set(_prime_factors(alph_len - offset)) | set(_prime_factors(alph_len)))
+        ),
+    }
 
 
 class ComputedStride(TypedDict):
@@ -49,16 +210,99 @@ class ComputedStride(TypedDict):
     stride_other_candidates: List[int]
 
 
-class Erdi8:
+class CheckResult(IntEnum):
+    """
+    Reason codes of the validator methods (see Erdi8.validate and Erdi8.validate_many).
+    """
+
+    VALID = 0
+    STARTS_WITH_NUMBER = 1
+    UNKNOWN_CHARACTER = 2
+    NOT_A_STRING = 3
+
+
+class _Erdi8Type(type):
+    """
+    Metaclass of Erdi8. On an Erdi8 object alph is a slot with the alphabet of the
+    object, on the class it is the configured alphabet (ALPHABET) as it was before
+    Erdi8 objects had slots. A subclass that sets alph configures ALPHABET.
+    """
+
+    def __new__(
+        mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any], **kwargs: Any
+    ) -> "_Erdi8Type":
+        if isinstance(namespace.get("alph"), str):
+            namespace = dict(namespace)
+            namespace["ALPHABET"] = namespace.pop("alph")
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+    @property
+    def alph(cls) -> str:
+        return cls.ALPHABET
+
+    @alph.setter
+    def alph(cls, value: str) -> None:
+        cls.ALPHABET = value
+
+
+class Erdi8(metaclass=_Erdi8Type):
     """
-    The Erdi8 class.
+    The Erdi8 class. Erdi8 objects are immutable and can be shared between threads;
+    all objects with the same configuration share their lookup tables. Use
+    Erdi8.get(safe) to reuse one object per configuration.
     """
 
     # A value of 8 avoids that the first character of the identifier is a number
     OFFSET = 8
     UNSAFE = "aeiou"
 
-    alph = "23456789abcdefghijkmnopqrstuvwxyz"
+    ALPHABET = "23456789abcdefghijkmnopqrstuvwxyz"
+
+    # The length of integers with up to (about) this many bits is looked up in a
+    # table, larger integers are encoded with a divide and conquer strategy. This
+    # covers all common digest sizes (up to SHA-512).
+    LARGE_BITS = 512
+    # Below this number of digits the divide and conquer codec stops splitting
+    LEAF_DIGITS = 64
+
+    __slots__ = (
+        "alph",
+        "alph_map",
+        "alph_len",
+        "is_safe",
+        "digit_table",
+        "_blocks",
+        "minis",
+        "powers",
+        "decode_bias",
+        "invalid_chars",
+        "leading_digits",
+        "alph_bytes",
+        "digit_bytes",
+        "next_bytes",
+        "leading_bytes",
+        "stride_primes",
+        "__weakref__",
+    )
+
+    alph: str
+    alph_map: Dict[str, int]
+    alph_len: int
+    is_safe: bool
+    digit_table: Dict[int, Any]
+    _blocks: Optional[Tuple[str, ...]]
+    minis: Tuple[int, ...]
+    powers: Tuple[int, ...]
+    decode_bias: Tuple[int, ...]
+    invalid_chars: Dict[int, Any]
+    leading_digits: str
+    alph_bytes: bytes
+    digit_bytes: bytes
+    next_bytes: bytes
+    leading_bytes: bytes
+    stride_primes: Tuple[int, ...]
+
+    _instances: Dict[Tuple[type, bool], "Erdi8"] = {}
 
     def __init__(self, safe: bool = False):
         """
@@ -68,11 +312,51 @@ class Erdi8:
         as a profanity filter.
 
         """
-        if safe:
-            self.alph = "".join([a for a in self.alph if a not in self.UNSAFE])
-        self.alph_map = {a: self.alph.find(a) for a in self.alph}
-        self.alph_len = len(self.alph)
-        self.is_safe = safe
+        cls = type(self)
+        tables = _tables(cls.ALPHABET, cls.UNSAFE, cls.OFFSET, cls.LARGE_BITS, bool(safe))
+        for name, value in tables.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "is_safe", safe)
+        object.__setattr__(self, "_blocks", None)
+
+    @classmethod
+    def get(cls, safe: bool = False) -> "Erdi8":
+        """
+        The shared Erdi8 object of a configuration, it is created on first use.
+
+        :param safe: see the constructor.
+        :returns: the Erdi8 object.
+        """
+        key = (cls, bool(safe))
+        instance = Erdi8._instances.get(key)
+        if instance is None:
+            instance = Erdi8._instances.setdefault(key, cls(bool(safe)))
+        return instance
+
+    @property
+    def blocks(self) -> Tuple[str, ...]:
+        """
+        All three character digit blocks ordered by their value. Encoding works on
+        blocks of three digits, the table of all alph_len**3 blocks is only built
+        (once per alphabet) when the first value is encoded.
+        """
+        blocks = self._blocks
+        if blocks is None:
+            blocks = _digit_blocks(self.alph)
+            object.__setattr__(self, "_blocks", blocks)
+        return blocks
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Error: Erdi8 objects are immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Error: Erdi8 objects are immutable.")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[bool]]:
+        return (type(self), (self.is_safe,))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(safe={self.is_safe!r})"
 
     def check(self, string: str) -> bool:
         """
@@ -80,23 +364,149 @@ class Erdi8:
 
         :param string: returns True if it's a valid erd8 string, otherwise False.
         """
-        if string == "":
+        if string == "" or (
+            string[0] not in self.leading_digits
+            and not string.translate(self.invalid_chars)
+        ):
             return True
-        flag = True
-        flag = string[0] not in self.alph[: self.OFFSET]
-        if not flag:
-            raise ValueError(
-                "Error: Not a valid erdi8 string, starts with " + string[0]
-            )
-        for i in string:
-            if self.alph_map.get(i) is None:
-                raise ValueError(
-                    "Error: Dectected unknown character: "
-                    + i
-                    + "; allowed are the following: "
-                    + self.alph
-                )
-        return flag
+        error = self.check_error(string)
+        if error is not None:
+            raise error
+        return True
+
+    def check_bytes(self, data: Any) -> bool:
+        """
+        Like check for ASCII bytes, e.g. a slice of a receive buffer.
+
+        :param data: bytes, bytearray or memoryview.
+        :returns: True if it's a valid erdi8 value, raises ValueError otherwise.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if not data or (
+            data[0] not in self.leading_bytes and not data.translate(None, self.alph_bytes)
+        ):
+            return True
+        error = self.check_error(data)
+        if error is not None:
+            raise error
+        return True
+
+    def validate(self, string: Union[str, bytes]) -> CheckResult:
+        """
+        Like check but returns a reason code instead of raising an exception.
+
+        :param string: erdi8 string (str or ASCII bytes).
+        :returns: CheckResult.VALID or the reason why the string is not valid.
+        """
+        if isinstance(string, str):
+            if not string:
+                return CheckResult.VALID
+            if string[0] in self.leading_digits:
+                return CheckResult.STARTS_WITH_NUMBER
+            if string.translate(self.invalid_chars):
+                return CheckResult.UNKNOWN_CHARACTER
+            return CheckResult.VALID
+        if isinstance(string, (bytes, bytearray)):
+            if not string:
+                return CheckResult.VALID
+            if string[0] in self.leading_bytes:
+                return CheckResult.STARTS_WITH_NUMBER
+            if string.translate(None, self.alph_bytes):
+                return CheckResult.UNKNOWN_CHARACTER
+            return CheckResult.VALID
+        return CheckResult.NOT_A_STRING
+
+    def check_error(self, string: Union[str, bytes]) -> Optional[ValueError]:
+        """
+        Materializes the error that check raises for an invalid string.
+
+        :param string: erdi8 string (str or ASCII bytes).
+        :returns: the ValueError or None if the string is valid.
+        """
+        reason = self.validate(string)
+        if reason == CheckResult.VALID:
+            return None
+        if reason == CheckResult.NOT_A_STRING:
+            return ValueError(f"Error: Not a valid erdi8 string, {string!r} is not a string.")
+        if isinstance(string, (bytes, bytearray)):
+            string = string.decode("latin-1")
+        if reason == CheckResult.STARTS_WITH_NUMBER:
+            return ValueError("Error: Not a valid erdi8 string, starts with " + string[0])
+        return ValueError(
+            "Error: Dectected unknown character: "
+            + string.translate(self.invalid_chars)[0]
+            + "; allowed are the following: "
+            + self.alph
+        )
+
+    def validate_many(self, strings: Any, reasons: bool = False) -> List[Any]:
+        """
+        Validates many strings at once without raising exceptions. NumPy string arrays
+        are validated in a vectorized way with a lookup table. Use check_error to get
+        the error message of an invalid string.
+
+        :param strings: iterable of erdi8 strings (str or ASCII bytes) or a NumPy string array,
+        other items (e.g. None) are invalid.
+        :param reasons: return CheckResult reason codes instead of booleans.
+        :returns: list of booleans (True for valid strings) or of CheckResult values.
+        """
+        np = _numpy()
+        if np is not None and isinstance(strings, np.ndarray) and strings.dtype.kind in "SU":
+            try:
+                codes, _, _, _ = self._validate_array(strings)
+            except UnicodeEncodeError:
+                strings = strings.tolist()
+            else:
+                if reasons:
+                    return [CheckResult(code) for code in codes.tolist()]
+                return (codes == 0).tolist()
+        if reasons:
+            return [self.validate(string) for string in strings]
+        digits = self.leading_digits
+        table = self.invalid_chars
+        return [
+            not string
+            or (string[0] not in digits and not string.translate(table))
+            if isinstance(string, str)
+            else not self.validate(string)
+            for string in strings
+        ]
+
+    def invalid_indices(self, strings: Any) -> List[int]:
+        """
+        :param strings: iterable of erdi8 strings or a NumPy string array.
+        :returns: the indices of the invalid strings.
+        """
+        return [i for i, valid in enumerate(self.validate_many(strings)) if not valid]
+
+    def _validate_array(self, array: Any) -> Tuple[Any, Any, Any, Any]:
+        """
+        Vectorized validation of a NumPy string array with a 256 entry lookup table.
+
+        :param array: NumPy array of str or bytes.
+        :returns: reason codes, alphabet index per character (-1 if unknown), string
+        lengths, and a mask for the characters that are part of the strings.
+        """
+        np = _numpy()
+        array = array.ravel()
+        if array.dtype.kind == "U":
+            array = array.astype(f"S{max(array.itemsize // 4, 1)}")
+        size = array.itemsize
+        chars = np.ascontiguousarray(array).view(np.uint8).reshape(-1, size)
+        lengths = (chars != 0).sum(axis=1)
+        lookup = np.full(256, -1, dtype=np.int8)
+        lookup[np.frombuffer(self.alph_bytes, dtype=np.uint8)] = np.arange(self.alph_len)
+        indices = lookup[chars]
+        in_string = np.arange(size) < lengths[:, None]
+        starts = (lengths > 0) & (indices[:, 0] >= 0) & (indices[:, 0] < self.OFFSET)
+        unknown = ((indices < 0) & in_string).any(axis=1)
+        codes = np.where(
+            starts,
+            int(CheckResult.STARTS_WITH_NUMBER),
+            np.where(unknown, int(CheckResult.UNKNOWN_CHARACTER), int(CheckResult.VALID)),
+        )
+        return codes, indices, lengths, in_string
 
     def increment(self, current: Optional[str] = None) -> Optional[str]:
         """
@@ -124,6 +534,26 @@ class Erdi8:
                 current.insert(0, self.alph[self.OFFSET - 1])
         return "".join(current)
 
+    def increment_bytes(self, current: Any = None) -> bytes:
+        """
+        Like increment for ASCII bytes. Only the trailing run of last characters (that
+        wrap around) and the character before them change, no per character loop.
+
+        :param current: current erdi8 value as bytes, bytearray or memoryview.
+        :returns: next erdi8 value as bytes.
+        """
+        if isinstance(current, memoryview):
+            current = current.tobytes()
+        if not current:
+            return self.alph_bytes[self.OFFSET : self.OFFSET + 1]
+        self.check_bytes(current)
+        head = bytes(current).rstrip(self.alph_bytes[-1:])
+        wrapped = self.alph_bytes[:1] * (len(current) - len(head))
+        if not head:
+            # all characters wrap around, the value gets one character longer
+            return self.alph_bytes[self.OFFSET : self.OFFSET + 1] + wrapped
+        return head[:-1] + head[-1:].translate(self.next_bytes) + wrapped
+
     def mod_space(self, length: int) -> Tuple[int, int, int]:
         """
         This function uses the decode_int function that has a loop in it. To get to the
@@ -137,6 +567,33 @@ class Erdi8:
         space = maxi - mini + 1
         return (mini, maxi, space)
 
+    def effective_stride(self, mini: int, space: int, stride: int) -> int:
+        """
+        The stride that is actually used in a mod space: the given stride is increased
+        until mini + stride and the size of the space are coprime. Otherwise the
+        sequence would not visit every value of the mod space.
+
+        :param mini: min value of the mod space (see mod_space)
+        :param space: size of the mod space (see mod_space)
+        :param stride: a int denoting the stride
+        :returns: the effective stride
+        """
+        gaps = self.coprime_gaps(space)
+        return stride + gaps[(mini + stride) % len(gaps)]
+
+    def coprime_gaps(self, space: int) -> Tuple[int, ...]:
+        """
+        The prime factors of a mod space size are known in advance (see stride_primes).
+        Coprimality to the space is therefore a lookup of the remainder modulo the
+        product of these primes in a precomputed table, which also tells how far it is
+        to the next coprime value.
+
+        :param space: size of the mod space (see mod_space)
+        :returns: table of distances to the next coprime value, indexed by the
+        remainder modulo the table size.
+        """
+        return _coprime_gaps(tuple(p for p in self.stride_primes if space % p == 0))
+
     def increment_fancy(self, current: str, stride: int) -> Optional[str]:
         """
         This method increments to the next value but uses a stride. It operates in a mod space
@@ -148,8 +605,7 @@ class Erdi8:
         if not self.check(current):
             return None
         mini, _, space = self.mod_space(len(current))
-        while math.gcd(mini + stride, space) != 1:
-            stride = stride + 1
+        stride = self.effective_stride(mini, space, stride)
         return self.encode_int(mini + ((self.decode_int(current) + stride) % space))
 
     def split_fancy_space(
@@ -166,8 +622,7 @@ class Erdi8:
         :returns: list of erdi8 values representing the start of each chunk
         """
         mini, _, space = self.mod_space(length)
-        while math.gcd(mini + stride, space) != 1:
-            stride = stride + 1
+        stride = self.effective_stride(mini, space, stride)
         chunk_size = space // number_chunks
         result = []
         for i in range(number_chunks):
@@ -190,20 +645,44 @@ class Erdi8:
         if not self.check(erdi8):
             return None
         mini, _, space = self.mod_space(len(erdi8))
-        while math.gcd(mini + stride, space) != 1:
-            stride = stride + 1
+        stride = self.effective_stride(mini, space, stride)
         chunk_size = space // number_chunks
         erdi8_int = self.decode_int(erdi8)
         index = ((erdi8_int - mini) * pow(mini + stride, -1, space)) % space
         return int(index // chunk_size)
 
-    def encode_int(self, div: int) -> str:
+    def encode_int(self, div: int, width: Optional[int] = None) -> str:
         """
-        This method encodes a integer to an erdi8 string.
+        This method encodes a integer to an erdi8 string. With a width, the integer is
+        encoded to a fixed-width key with exactly width characters (the integer plus
+        the min value of the mod space of that length, see mod_space). Fixed-width keys
+        sort lexicographically (also byte-wise) in the same order as the integers.
 
         :param div: integer to be encoded.
+        :param width: optional fixed width of the result.
         :returns: encoded integer as erdi8 value.
         """
+        if width is not None:
+            div = self._fixed(div, width)
+        if 0 <= div < self.minis[-1]:
+            length = bisect.bisect_right(self.minis, div)
+            first, rest = divmod(div - self.minis[length - 1], self.powers[length - 1])
+            blocks = self._blocks or self.blocks
+            if length <= 4:
+                return self.alph[first + self.OFFSET] + blocks[rest][4 - length :]
+            if length <= 7:
+                high, low = divmod(rest, self.powers[3])
+                return (
+                    self.alph[first + self.OFFSET]
+                    + blocks[high][7 - length :]
+                    + blocks[low]
+                )
+            return self.alph[first + self.OFFSET] + self._encode_digits(
+                rest, length - 1
+            )
+        if div > 0:
+            return self._encode_large(div)
+        # negative integers keep the historic digit by digit behaviour
         result = ""
         mod = div % self.alph_len
         div = div // self.alph_len
@@ -220,27 +699,339 @@ class Erdi8:
             mod = mod + self.OFFSET
         return self.alph[mod % self.alph_len] + result
 
-    def decode_int(self, erdi8: str) -> Optional[int]:
+    def decode_int(self, erdi8: str, width: Optional[int] = None) -> Optional[int]:
         """
         This method retuns a integer given a erdi8 string.
 
         :param erdi8: erdi8 string to be decoded.
+        :param width: optional fixed width, decodes a key created by encode_int with width.
         :returns: decoded integer value.
         """
+        if width is not None:
+            if len(erdi8) != width:
+                raise ValueError(
+                    f"Error: '{erdi8}' doesn't have a width of {width} characters."
+                )
+            return self.decode_int(erdi8) - self._length_mini(width)
         if not self.check(erdi8):
             return None
-        result = 0
-        counter = 0
-        while erdi8:
-            tail = erdi8[-1]
-            erdi8 = erdi8[:-1]
-            result = (
-                result
-                + (self.alph_map[tail] + 1) * (self.alph_len**counter)
-                - self.OFFSET * self.alph_len**counter
+        if not erdi8:
+            return -1
+        if len(erdi8) <= len(self.decode_bias):
+            return int(erdi8.translate(self.digit_table), self.alph_len) + self.decode_bias[
+                len(erdi8) - 1
+            ]
+        return self._decode_large(erdi8)
+
+    def encode_int_bytes(self, div: int, width: Optional[int] = None) -> bytes:
+        """
+        Like encode_int but returns ASCII bytes.
+
+        :param div: integer to be encoded.
+        :param width: optional fixed width of the result.
+        :returns: encoded integer as erdi8 value (bytes).
+        """
+        return self.encode_int(div, width).encode("ascii")
+
+    def encode_int_into(
+        self, div: int, buffer: Any, offset: int = 0, width: Optional[int] = None
+    ) -> int:
+        """
+        Like encode_int but writes the ASCII characters into a caller provided buffer
+        (e.g. a send buffer) at an offset. The buffer is never resized.
+
+        :param div: integer to be encoded.
+        :param buffer: writable bytearray or memoryview.
+        :param offset: position of the first character in the buffer.
+        :param width: optional fixed width of the result.
+        :returns: the offset after the written value.
+        """
+        data = self.encode_int(div, width).encode("ascii")
+        end = offset + len(data)
+        if not 0 <= offset <= end <= len(buffer):
+            raise ValueError(f"Error: {len(data)} bytes don't fit at offset {offset}.")
+        buffer[offset:end] = data
+        return end
+
+    def decode_int_bytes(self, data: Any, width: Optional[int] = None) -> int:
+        """
+        Like decode_int for ASCII bytes, e.g. a slice of a receive buffer. The digits
+        are translated and parsed by int() without decoding to str first.
+
+        :param data: erdi8 value as bytes, bytearray or memoryview.
+        :param width: optional fixed width, decodes a key created by encode_int with width.
+        :returns: decoded integer value.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if width is not None:
+            if len(data) != width:
+                raise ValueError(
+                    f"Error: {bytes(data)!r} doesn't have a width of {width} characters."
+                )
+            return self.decode_int_bytes(data) - self._length_mini(width)
+        self.check_bytes(data)
+        if not data:
+            return -1
+        if len(data) <= len(self.decode_bias):
+            return int(data.translate(self.digit_bytes), self.alph_len) + self.decode_bias[
+                len(data) - 1
+            ]
+        return self._decode_large(data.decode("ascii"))
+
+    def _fixed(self, div: int, width: int) -> int:
+        """
+        :param div: integer to be encoded with a fixed width.
+        :param width: the width.
+        :returns: the integer that is encoded to the fixed-width key.
+        """
+        space = self._length_mini(width + 1) - self._length_mini(width)
+        if width < 1 or not 0 <= div < space:
+            raise ValueError(
+                f"Error: {div} can't be encoded with a width of {width} characters."
+            )
+        return div + self._length_mini(width)
+
+    def _length_mini(self, length: int) -> int:
+        """
+        Closed form of the min value of the mod space (see mod_space) for a given length.
+
+        :param length: the length of the erdi8 identifier
+        :returns: the smallest integer that is encoded with this length.
+        """
+        if 0 < length <= len(self.minis):
+            return self.minis[length - 1]
+        return (
+            (self.alph_len - self.OFFSET)
+            * (int(self.alph_len ** (length - 1)) - 1)
+            // (self.alph_len - 1)
+        )
+
+    def _encode_large(self, div: int) -> str:
+        """
+        Divide and conquer version of encode_int for large integers. It determines the
+        length of the result first. The remainder within the mod space of that length
+        is then converted to a fixed number of digits by splitting it recursively with
+        precomputed powers of the alphabet length.
+
+        :param div: positive integer to be encoded.
+        :returns: encoded integer as erdi8 value.
+        """
+        length = int(div.bit_length() / math.log2(self.alph_len)) + 1
+        while self._length_mini(length) > div:
+            length = length - 1
+        while self._length_mini(length + 1) <= div:
+            length = length + 1
+        first, rest = divmod(
+            div - self._length_mini(length), self.alph_len ** (length - 1)
+        )
+        return self.alph[first + self.OFFSET] + self._encode_digits(rest, length - 1)
+
+    def _encode_digits(self, value: int, count: int) -> str:
+        """
+        Converts value to exactly count digits of the alphabet (plain positional
+        notation, leading digits are filled with the zero digit).
+
+        :param value: integer smaller than alph_len to the power of count.
+        :param count: number of digits.
+        :returns: string of count digits.
+        """
+        if count <= self.LEAF_DIGITS:
+            blocks = self.blocks
+            result = []
+            cube = self.alph_len**3
+            while count > 3:
+                value, mod = divmod(value, cube)
+                result.append(blocks[mod])
+                count = count - 3
+            # the remaining (at most three) leading digits are the tail of a block
+            result.append(blocks[value][3 - count :])
+            return "".join(reversed(result))
+        half = self._split(count)
+        high, low = divmod(value, _power(self.alph_len, half))
+        return self._encode_digits(high, count - half) + self._encode_digits(
+            low, half
+        )
+
+    def _split(self, count: int) -> int:
+        """
+        :param count: number of digits (more than LEAF_DIGITS).
+        :returns: the number of low digits to split off, the largest LEAF_DIGITS times a
+        power of two below count.
+        """
+        half = self.LEAF_DIGITS
+        while 2 * half < count:
+            half = 2 * half
+        return half
+
+    def _decode_large(self, erdi8: str) -> int:
+        """
+        Divide and conquer version of decode_int for long (already checked) erdi8 strings.
+
+        :param erdi8: erdi8 string to be decoded.
+        :returns: decoded integer value.
+        """
+        return (
+            self._length_mini(len(erdi8))
+            + (self.alph_map[erdi8[0]] - self.OFFSET)
+            * int(self.alph_len ** (len(erdi8) - 1))
+            + self._decode_digits(erdi8[1:])
+        )
+
+    def _decode_digits(self, digits: str) -> int:
+        """
+        Converts a string of alphabet digits (plain positional notation) to an integer.
+
+        :param digits: string of alphabet digits.
+        :returns: the integer value.
+        """
+        if len(digits) <= self.LEAF_DIGITS:
+            return int(digits.translate(self.digit_table), self.alph_len) if digits else 0
+        half = self._split(len(digits))
+        return self._decode_digits(digits[:-half]) * _power(
+            self.alph_len, half
+        ) + self._decode_digits(digits[-half:])
+
+    def encode_many(
+        self, values: Any, record_size: Optional[int] = None, width: Optional[int] = None
+    ) -> List[str]:
+        """
+        This method encodes many integers to erdi8 strings at once. If NumPy is installed,
+        integer arrays (and byte records of up to 8 bytes) are encoded in a vectorized
+        way, otherwise it falls back to encode_int for every value. The output is identical
+        to calling encode_int on every value.
+
+        :param values: a NumPy integer array, an iterable of integers, or - if record_size
+        is set - a bytes-like object of concatenated big-endian records.
+        :param record_size: size in bytes of each record in values.
+        :param width: optional fixed width of the results (see encode_int).
+        :returns: list of encoded integers as erdi8 values.
+        """
+        np = _numpy()
+        if record_size is not None:
+            data = memoryview(values).cast("B")
+            if record_size < 1 or len(data) % record_size != 0:
+                raise ValueError(
+                    f"Error: {len(data)} bytes can't be split into records of size {record_size}."
+                )
+            if np is not None and record_size <= 8:
+                records = np.zeros((len(data) // record_size, 8), dtype=np.uint8)
+                records[:, 8 - record_size :] = np.frombuffer(
+                    data, dtype=np.uint8
+                ).reshape(-1, record_size)
+                return self._encode_array(records.view(">u8").ravel(), width)
+            return [
+                self.encode_int(int.from_bytes(data[i : i + record_size], "big"), width)
+                for i in range(0, len(data), record_size)
+            ]
+        if np is not None:
+            array = np.asarray(values) if not isinstance(values, np.ndarray) else values
+            if array.dtype.kind in "iu":
+                return self._encode_array(array.ravel(), width)
+        result = []
+        for value in values:
+            if value < 0:
+                raise ValueError(
+                    f"Error: We only encode non-negative integers. You provided {value}."
+                )
+            result.append(self.encode_int(value, width))
+        return result
+
+    def _encode_array(self, array: Any, width: Optional[int] = None) -> List[str]:
+        """
+        Vectorized version of encode_int for NumPy integer arrays. All digits of one
+        position are extracted at once, including the OFFSET carry.
+
+        :param array: one-dimensional NumPy integer array.
+        :param width: optional fixed width of the results (see encode_int).
+        :returns: list of encoded integers as erdi8 values.
+        """
+        np = _numpy()
+        if array.dtype.kind == "i" and (array < 0).any():
+            raise ValueError(
+                f"Error: We only encode non-negative integers. You provided {array.min()}."
             )
-            counter = counter + 1
-        return int(result - 1)
+        div = array.astype(np.uint64)
+        if width is not None:
+            if width < 1 or self._length_mini(width + 1) > 2**64 or not len(array):
+                return [self.encode_int(value, width) for value in array.tolist()]
+            mini = self._length_mini(width)
+            if int(div.max()) >= self._length_mini(width + 1) - mini:
+                raise ValueError(
+                    f"Error: {div.max()} can't be encoded with a width of {width} characters."
+                )
+            div = div + np.uint64(mini)
+        alph_len = np.uint64(self.alph_len)
+        offset = np.uint64(self.OFFSET)
+        # 64 bit values never need more digits than this
+        digits = np.zeros((len(div), math.ceil(64 / math.log2(self.alph_len)) + 1), dtype=np.uint8)
+        lengths = np.ones(len(div), dtype=np.intp)
+        active = np.ones(len(div), dtype=bool)
+        width = digits.shape[1]
+        for col in range(width - 1, -1, -1):
+            div, mod = np.divmod(div, alph_len)
+            mod += offset
+            carry = mod >= alph_len
+            digits[:, col] = mod - carry * alph_len
+            div += carry
+            active &= div >= 1
+            if not active.any():
+                break
+            lengths += active
+            div = np.where(active, div - np.uint64(1), np.uint64(0))
+        # digits are collected from the right, left-align them per row
+        digits = digits[:, col:]
+        width = width - col
+        chars = np.frombuffer(self.alph.encode("ascii"), dtype=np.uint8)[digits]
+        cols = np.arange(width) + (width - lengths)[:, None]
+        chars = np.take_along_axis(chars, np.minimum(cols, width - 1), axis=1)
+        chars[cols >= width] = 0
+        return chars.view(f"S{width}").ravel().astype(f"U{width}").tolist()
+
+    def decode_many(self, erdi8s: Any, width: Optional[int] = None) -> List[int]:
+        """
+        This method decodes many erdi8 strings at once. If NumPy is installed, strings
+        of up to 12 characters are decoded in a vectorized way, otherwise it falls back
+        to decode_int for every value. The output is identical to calling decode_int on
+        every value.
+
+        :param erdi8s: iterable of erdi8 strings or a NumPy string array.
+        :param width: optional fixed width, decodes keys created with a width.
+        :returns: list of decoded integer values.
+        """
+        np = _numpy()
+        # decode_int raises on invalid values, it never returns None here
+        if np is None:
+            return cast(List[int], [self.decode_int(e, width) for e in erdi8s])
+        array = np.asarray(erdi8s) if not isinstance(erdi8s, np.ndarray) else erdi8s
+        array = array.ravel()
+        if array.dtype.kind == "U":
+            array = array.astype(f"S{max(array.itemsize // 4, 1)}")
+        if array.dtype.kind != "S" or array.itemsize > 12:
+            return cast(
+                List[int],
+                [
+                    self.decode_int(e.decode("ascii") if isinstance(e, bytes) else e, width)
+                    for e in array.tolist()
+                ],
+            )
+        codes, indices, lengths, in_string = self._validate_array(array)
+        error = self.check_error(array[int(np.argmax(codes != 0))])
+        if error is not None:
+            raise error
+        if width is not None and (lengths != width).any():
+            bad = array[int(np.argmax(lengths != width))].decode("ascii")
+            raise ValueError(f"Error: '{bad}' doesn't have a width of {width} characters.")
+        result = np.zeros(len(array), dtype=np.int64)
+        for i in range(array.itemsize):
+            result = np.where(
+                in_string[:, i],
+                result * self.alph_len + indices[:, i] + 1 - self.OFFSET,
+                result,
+            )
+        if width is not None:
+            result = result - self._length_mini(width)
+        return (result - 1).tolist()
 
     def encode_four_bytes(self, bts: List[int]) -> str:
         """
@@ -297,6 +1088,156 @@ class Erdi8:
                 f"Error: We only decode 7 characters at at time. You provided {len(erdi8)} characters."
             )
 
+    def fixed_width(self, size: int) -> int:
+        """
+        The width that every value of size bytes can be encoded with (see the width
+        parameter of encode_int). It is used by the fixed option of the digest, UUID
+        and xid codecs.
+
+        :param size: number of bytes.
+        :returns: the smallest width with a mod space of at least 256**size values.
+        """
+        return _fixed_width(self.alph_len, self.OFFSET, size)
+
+    def encode_digest(self, digest: bytes, fixed: bool = False) -> str:
+        """
+        This method encodes a fixed-size byte string (e.g. a hash digest) as big-endian
+        integer. With fixed=True all digests of the same size get the same length.
+
+        :param digest: bytes-like object.
+        :param fixed: encode with fixed_width(len(digest)).
+        :returns: erdi8 value.
+        """
+        return self.encode_int(
+            int.from_bytes(digest, "big"), self.fixed_width(len(digest)) if fixed else None
+        )
+
+    def decode_digest(self, erdi8: str, size: int, fixed: bool = False) -> bytes:
+        """
+        This method decodes an erdi8 string created by encode_digest.
+
+        :param erdi8: erdi8 string to be decoded.
+        :param size: size of the digest in bytes.
+        :param fixed: whether the digest was encoded with fixed=True.
+        :returns: the digest.
+        """
+        value = self.decode_int(erdi8, self.fixed_width(size) if fixed else None)
+        if not 0 <= value < 1 << (8 * size):
+            raise ValueError(f"Error: '{erdi8}' doesn't fit into {size} bytes.")
+        return value.to_bytes(size, "big")
+
+    def encode_digests(self, digests: Iterable[bytes], fixed: bool = False) -> List[str]:
+        """
+        Batch version of encode_digest.
+
+        :param digests: iterable of bytes-like objects.
+        :param fixed: encode with fixed_width of the digest size.
+        :returns: list of erdi8 values.
+        """
+        if not fixed:
+            return [self.encode_int(int.from_bytes(digest, "big")) for digest in digests]
+        return [self.encode_digest(digest, True) for digest in digests]
+
+    def decode_digests(self, erdi8s: Iterable[str], size: int, fixed: bool = False) -> List[bytes]:
+        """
+        Batch version of decode_digest.
+
+        :param erdi8s: iterable of erdi8 strings.
+        :param size: size of the digests in bytes.
+        :param fixed: whether the digests were encoded with fixed=True.
+        :returns: list of digests.
+        """
+        return [self.decode_digest(erdi8, size, fixed) for erdi8 in erdi8s]
+
+    def encode_uuid(self, value: "uuid.UUID", fixed: bool = False) -> str:
+        """
+        This method encodes a UUID (via its 128 bit integer value).
+
+        :param value: the UUID.
+        :param fixed: encode with fixed_width(16), i.e. all UUIDs get the same length.
+        :returns: erdi8 value.
+        """
+        return self.encode_int(value.int, self.fixed_width(16) if fixed else None)
+
+    def decode_uuid(self, erdi8: str, fixed: bool = False) -> "uuid.UUID":
+        """
+        This method decodes an erdi8 string created by encode_uuid.
+
+        :param erdi8: erdi8 string to be decoded.
+        :param fixed: whether the UUID was encoded with fixed=True.
+        :returns: the UUID.
+        """
+        value = self.decode_int(erdi8, self.fixed_width(16) if fixed else None)
+        if not 0 <= value < 1 << 128:
+            raise ValueError(f"Error: '{erdi8}' is not a valid UUID.")
+        import uuid
+
+        return uuid.UUID(int=value)
+
+    def encode_uuids(self, values: Iterable["uuid.UUID"], fixed: bool = False) -> List[str]:
+        """
+        Batch version of encode_uuid.
+
+        :param values: iterable of UUIDs.
+        :param fixed: encode with fixed_width(16).
+        :returns: list of erdi8 values.
+        """
+        width = self.fixed_width(16) if fixed else None
+        return [self.encode_int(value.int, width) for value in values]
+
+    def decode_uuids(self, erdi8s: Iterable[str], fixed: bool = False) -> List["uuid.UUID"]:
+        """
+        Batch version of decode_uuid.
+
+        :param erdi8s: iterable of erdi8 strings.
+        :param fixed: whether the UUIDs were encoded with fixed=True.
+        :returns: list of UUIDs.
+        """
+        return [self.decode_uuid(erdi8, fixed) for erdi8 in erdi8s]
+
+    def encode_xid(self, xid: Any, fixed: bool = False) -> str:
+        """
+        This method encodes the 12 bytes of an xid (see https://github.com/rs/xid).
+
+        :param xid: the 12 bytes (bytes-like or list of ints, e.g. Xid().value).
+        :param fixed: encode with fixed_width(12), i.e. all xids get the same length.
+        :returns: erdi8 value.
+        """
+        xid = bytes(xid)
+        if len(xid) != 12:
+            raise ValueError(f"Error: An xid has 12 bytes. You provided {len(xid)} bytes.")
+        return self.encode_digest(xid, fixed)
+
+    def decode_xid(self, erdi8: str, fixed: bool = False) -> bytes:
+        """
+        This method decodes an erdi8 string created by encode_xid.
+
+        :param erdi8: erdi8 string to be decoded.
+        :param fixed: whether the xid was encoded with fixed=True.
+        :returns: the 12 bytes of the xid (e.g. for Xid(...)).
+        """
+        return self.decode_digest(erdi8, 12, fixed)
+
+    def encode_xids(self, xids: Iterable[Any], fixed: bool = False) -> List[str]:
+        """
+        Batch version of encode_xid.
+
+        :param xids: iterable of xids (12 bytes each).
+        :param fixed: encode with fixed_width(12).
+        :returns: list of erdi8 values.
+        """
+        return [self.encode_xid(xid, fixed) for xid in xids]
+
+    def decode_xids(self, erdi8s: Iterable[str], fixed: bool = False) -> List[bytes]:
+        """
+        Batch version of decode_xid.
+
+        :param erdi8s: iterable of erdi8 strings.
+        :param fixed: whether the xids were encoded with fixed=True.
+        :returns: list of xids (12 bytes each).
+        """
+        return self.decode_digests(erdi8s, 12, fixed)
+
     def compute_stride(self, erdi8: str, next_erdi8: str) -> ComputedStride:
         """
         This method computes possible stride values as well as the finally effective
@@ -321,7 +1262,8 @@ class Erdi8:
         result = next_erdi8_int - erdi8_int - mini
         while result < 0:
             result = result + space
-        if math.gcd(mini + result, space) != 1:
+        gaps = self.coprime_gaps(space)
+        if gaps[(mini + result) % len(gaps)]:
             raise ValueError(
                 f"Error: '{result}' was detected as a stride but it is not suitable for an "
                 f"erdi8 mod space with length '{len(erdi8)}'. "
@@ -329,7 +1271,7 @@ class Erdi8:
             )
         candidates = []
         stride = result - 1
-        while math.gcd(mini + stride, space) != 1:
+        while gaps[(mini + stride) % len(gaps)]:
             candidates.append(stride)
             stride = stride - 1
         return {"stride_effective": result, "stride_other_candidates": candidates}
@@ -0,0 +1,518 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Helpers for "fancy" identifiers, i.e. fixed length erdi8 identifiers that are
+generated with a stride in a mod space (see Erdi8.increment_fancy).
+"""
+
+import bisect
+import datetime
+import math
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypedDict,
+    Union,
+    overload,
+)
+
+from erdi8.erdi8 import CheckResult, Erdi8
+
+
+class Capacity(TypedDict):
+    """
+    Custom type for the usage of a fancy sequence (or of one chunk of it). The start
+    value counts as issued; once remaining is 0, the next value would be one that was
+    issued before. exhausted_at is the projected point in time at which this happens
+    at the given issue rate (None without a rate or if it is too far in the future
+    for datetime).
+    """
+
+    total: int
+    issued: int
+    remaining: int
+    exhausted_at: Optional[datetime.datetime]
+
+
+def _capacity(
+    total: int, issued: int, rate: Optional[float], now: Optional[datetime.datetime]
+) -> Capacity:
+    """
+    :param total: number of values of the sequence or chunk.
+    :param issued: number of issued values.
+    :param rate: observed number of issued values per second.
+    :param now: point in time of the observation, defaults to the current UTC time.
+    :returns: the capacity figures.
+    """
+    exhausted_at = None
+    if rate:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        try:
+            exhausted_at = now + datetime.timedelta(seconds=(total - issued) / rate)
+        except OverflowError:
+            exhausted_at = None
+    return {
+        "total": total,
+        "issued": issued,
+        "remaining": total - issued,
+        "exhausted_at": exhausted_at,
+    }
+
+
+class FancySequence(Iterator[str]):
+    """
+    Generator for fancy identifiers of one fixed (length, stride) pair. The mod space
+    and the effective stride are resolved once, every step is plain integer arithmetic
+    followed by an encode. The produced values are the same as calling
+    Erdi8.increment_fancy in a loop.
+    """
+
+    def __init__(self, e8: Erdi8, current: str, stride: int):
+        """
+        FancySequence Constructor.
+
+        :param e8: the Erdi8 object to encode with.
+        :param current: current erdi8 value, the first generated value is the one after it.
+        :param stride: stride parameter - a int denoting the stride
+        """
+        e8.check(current)
+        if not current:
+            raise ValueError("Error: A fancy sequence needs a non-empty current value.")
+        self.e8 = e8
+        self.length = len(current)
+        self.mini, _, self.space = e8.mod_space(self.length)
+        self.stride = e8.effective_stride(self.mini, self.space, stride)
+        self.step = (self.mini + self.stride) % self.space
+        self.position = e8.decode_int(current) - self.mini
+        self.head = e8.alph_len ** (self.length - 1)
+
+    @property
+    def current(self) -> str:
+        """
+        The last generated (or the initial) erdi8 value.
+        """
+        return self._encode(self.position)
+
+    def _encode(self, position: int) -> str:
+        """
+        Encodes a position in the mod space. As the length is fixed this is the same as
+        encode_int(mini + position) without having to figure out the length.
+
+        :param position: position in the mod space
+        :returns: erdi8 value
+        """
+        first, rest = divmod(position, self.head)
+        return self.e8.alph[first + self.e8.OFFSET] + self.e8._encode_digits(
+            rest, self.length - 1
+        )
+
+    def __iter__(self) -> "FancySequence":
+        return self
+
+    def __next__(self) -> str:
+        position = self.position + self.step
+        if position >= self.space:
+            position = position - self.space
+        self.position = position
+        return self._encode(position)
+
+    def skip(self, number: int) -> None:
+        """
+        Advances the sequence by number values without generating them.
+
+        :param number: how many values to skip
+        """
+        self.position = (self.position + number * self.step) % self.space
+
+    def next_n(self, number: int) -> List[str]:
+        """
+        Generates the next number values of the sequence.
+
+        :param number: how many values to generate
+        :returns: list of the next erdi8 values
+        """
+        step, space = self.step, self.space
+        encode = self._encode
+        position = self.position
+        result = []
+        for _ in range(number):
+            position = position + step
+            if position >= space:
+                position = position - space
+            result.append(encode(position))
+        self.position = position
+        return result
+
+
+class FancyView(Sequence[str]):
+    """
+    Read-only random-access view over a whole fancy sequence: item 0 is the start
+    value, item i is the value after i calls of Erdi8.increment_fancy. Since the
+    positions in the mod space are linear in i (the same structure
+    Erdi8.fancy_split_index relies on), indexing, index and membership tests are
+    O(1). Nothing is materialized, slices are returned as lazy iterators.
+    """
+
+    def __init__(self, e8: Erdi8, start: str, stride: int):
+        """
+        FancyView Constructor.
+
+        :param e8: the Erdi8 object to encode with.
+        :param start: start erdi8 value, i.e. item 0 of the view.
+        :param stride: stride parameter - a int denoting the stride
+        """
+        self.e8 = e8
+        self.start = start
+        self.sequence = FancySequence(e8, start, stride)
+        self.length = self.sequence.length
+        self.mini = self.sequence.mini
+        self.space = self.sequence.space
+        self.step = self.sequence.step
+        self.origin = self.sequence.position
+        self.inverse = int(pow(self.step, -1, self.space))
+
+    def __len__(self) -> int:
+        return self.space
+
+    @property
+    def size(self) -> int:
+        """
+        Number of distinct values of the view, i.e. the size of the mod space.
+        """
+        return self.space
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Iterator[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, Iterator[str]]:
+        if isinstance(index, slice):
+            return self._slice(range(self.space)[index])
+        if index < 0:
+            index = index + self.space
+        if not 0 <= index < self.space:
+            raise IndexError(f"Error: Index {index} is out of range.")
+        return self.sequence._encode((self.origin + index * self.step) % self.space)
+
+    def _slice(self, indices: range) -> Iterator[str]:
+        """
+        :param indices: the (already normalized) indices of a slice.
+        :returns: iterator over the values at these indices.
+        """
+        space = self.space
+        step = (indices.step * self.step) % space
+        position = (self.origin + indices.start * self.step) % space
+        encode = self.sequence._encode
+        for _ in indices:
+            yield encode(position)
+            position = position + step
+            if position >= space:
+                position = position - space
+
+    def __iter__(self) -> Iterator[str]:
+        return self._slice(range(self.space))
+
+    def __contains__(self, value: Any) -> bool:
+        return (
+            isinstance(value, str)
+            and len(value) == self.length
+            and self.e8.validate(value) == CheckResult.VALID
+        )
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        """
+        :param value: erdi8 value to look up.
+        :param start: only look at indices from start on.
+        :param stop: only look at indices before stop.
+        :returns: the index of the value in the view.
+        """
+        if value not in self:
+            raise ValueError(f"Error: {value!r} is not in the view.")
+        decoded = self.e8.decode_int(value, self.length)
+        assert decoded is not None
+        index = ((decoded - self.origin) * self.inverse) % self.space
+        start, stop, _ = slice(start, stop).indices(self.space)
+        if not start <= index < stop:
+            raise ValueError(f"Error: {value!r} is not in the view between {start} and {stop}.")
+        return index
+
+    def capacity(
+        self,
+        current: str,
+        rate: Optional[float] = None,
+        now: Optional[datetime.datetime] = None,
+    ) -> Capacity:
+        """
+        How much of the mod space is used if current is the last issued value (and
+        the start value was the first one).
+
+        :param current: the last issued erdi8 value.
+        :param rate: observed number of issued values per second (for exhausted_at).
+        :param now: point in time of the observation, defaults to the current UTC time.
+        :returns: the capacity figures.
+        """
+        return _capacity(self.space, self.index(current) + 1, rate, now)
+
+    def count(self, value: Any) -> int:
+        """
+        :param value: erdi8 value to count.
+        :returns: 1 if the value is in the view, 0 otherwise (a fancy sequence visits
+        every value of the mod space exactly once).
+        """
+        return 1 if value in self else 0
+
+
+class ShardRouter:
+    """
+    Assigns fancy identifiers of one (length, stride) pair to chunks of the mod space
+    like Erdi8.split_fancy_space and Erdi8.fancy_split_index, but with the mod space,
+    the effective stride and the modular inverse computed once. Chunks can be split
+    and merged for rebalancing. Chunk i covers the positions (in the order of
+    increment_fancy) from the start of chunk i to the start of chunk i + 1; the
+    last chunk ends at the start of the first one.
+    """
+
+    def __init__(self, e8: Erdi8, length: int, stride: int, number_chunks: int):
+        """
+        ShardRouter Constructor.
+
+        :param e8: the Erdi8 object to encode with.
+        :param length: the length of the erdi8 identifiers
+        :param stride: a int denoting the stride
+        :param number_chunks: number of chunks to split the space into
+        """
+        self.e8 = e8
+        self.length = length
+        self.mini, _, self.space = e8.mod_space(length)
+        if not 1 <= number_chunks <= self.space:
+            raise ValueError(
+                f"Error: The number of chunks must be between 1 and {self.space}. "
+                f"You provided {number_chunks}."
+            )
+        self.stride = e8.effective_stride(self.mini, self.space, stride)
+        self.step = (self.mini + self.stride) % self.space
+        self.inverse = int(pow(self.mini + self.stride, -1, self.space))
+        chunk_size = self.space // number_chunks
+        # positions of the chunk starts, position 0 is the start of the first chunk
+        self.boundaries = [chunk_size * i for i in range(number_chunks)]
+
+    def __len__(self) -> int:
+        return len(self.boundaries)
+
+    def position(self, erdi8: str) -> int:
+        """
+        :param erdi8: erdi8 value of the mod space
+        :returns: position of the value in the sequence that starts at the first chunk
+        """
+        value = self.e8.decode_int(erdi8, self.length)
+        assert value is not None
+        return (value * self.inverse) % self.space
+
+    def route(self, erdi8: str) -> int:
+        """
+        :param erdi8: erdi8 value of the mod space
+        :returns: the index of the chunk the value belongs to
+        """
+        return bisect.bisect_right(self.boundaries, self.position(erdi8)) - 1
+
+    def route_many(self, erdi8s: Iterable[str]) -> List[int]:
+        """
+        :param erdi8s: erdi8 values of the mod space
+        :returns: the indices of the chunks the values belong to
+        """
+        boundaries, inverse, space = self.boundaries, self.inverse, self.space
+        return [
+            bisect.bisect_right(boundaries, (value * inverse) % space) - 1
+            for value in self.e8.decode_many(erdi8s, self.length)
+        ]
+
+    def starts(self) -> List[str]:
+        """
+        :returns: list of erdi8 values representing the start of each chunk
+        """
+        return [
+            self.e8.encode_int(self.mini + (boundary * self.step) % self.space)
+            for boundary in self.boundaries
+        ]
+
+    def sizes(self) -> List[int]:
+        """
+        :returns: list of the number of identifiers of each chunk
+        """
+        ends = self.boundaries[1:] + [self.space]
+        return [end - start for start, end in zip(self.boundaries, ends)]
+
+    def capacity(
+        self,
+        index: int,
+        current: str,
+        rate: Optional[float] = None,
+        now: Optional[datetime.datetime] = None,
+    ) -> Capacity:
+        """
+        How much of a chunk is used if current is the last value issued by it (starting
+        with the start value of the chunk, see starts).
+
+        :param index: index of the chunk.
+        :param current: the last erdi8 value issued by the chunk.
+        :param rate: observed number of issued values per second (for exhausted_at).
+        :param now: point in time of the observation, defaults to the current UTC time.
+        :returns: the capacity figures of the chunk.
+        """
+        position = self.position(current)
+        if bisect.bisect_right(self.boundaries, position) - 1 != index:
+            raise ValueError(f"Error: '{current}' doesn't belong to chunk {index}.")
+        return _capacity(
+            self.sizes()[index], position - self.boundaries[index] + 1, rate, now
+        )
+
+    def split(self, index: int) -> None:
+        """
+        Splits a chunk into two halves. The new chunk gets the index index + 1, the
+        indices of all following chunks increase by one.
+
+        :param index: index of the chunk to split
+        """
+        if not 0 <= index < len(self.boundaries):
+            raise ValueError(f"Error: There is no chunk {index}.")
+        size = self.sizes()[index]
+        if size < 2:
+            raise ValueError(f"Error: Chunk {index} is too small to be split.")
+        self.boundaries.insert(index + 1, self.boundaries[index] + size // 2)
+
+    def merge(self, index: int) -> None:
+        """
+        Merges a chunk with the following one. The indices of all later chunks
+        decrease by one.
+
+        :param index: index of the chunk to merge with chunk index + 1
+        """
+        if not 0 <= index < len(self.boundaries) - 1:
+            raise ValueError(f"Error: Chunk {index} has no following chunk to merge with.")
+        del self.boundaries[index + 1]
+
+
+class StridePlanner:
+    """
+    Finds and rates strides for one mod space. A stride is valid if mini + stride is
+    coprime to the size of the space; as the prime factors of the space are known
+    (see Erdi8.stride_primes), validity is a table lookup and the next valid stride
+    is found without trying candidates one by one.
+
+    The dispersion of a stride is rated with the continued fraction of step / space
+    (step being the distance between consecutive values, see increment_fancy): the
+    smaller its largest partial quotient, the more evenly consecutive identifiers
+    spread over the space (the golden ratio, all partial quotients 1, is optimal).
+    """
+
+    def __init__(self, e8: Erdi8, length: int):
+        """
+        StridePlanner Constructor.
+
+        :param e8: the Erdi8 object.
+        :param length: the length of the erdi8 identifiers
+        """
+        self.e8 = e8
+        self.length = length
+        self.mini, _, self.space = e8.mod_space(length)
+        self.gaps = e8.coprime_gaps(self.space)
+        self.modulus = len(self.gaps)
+
+    def is_valid(self, stride: int) -> bool:
+        """
+        :param stride: a int denoting the stride
+        :returns: whether the stride is used as it is (i.e. it is its own effective stride)
+        """
+        return not self.gaps[(self.mini + stride) % self.modulus]
+
+    def next_valid(self, stride: int) -> int:
+        """
+        :param stride: a int denoting the stride
+        :returns: the smallest valid stride >= stride, i.e. the effective stride
+        """
+        return stride + self.gaps[(self.mini + stride) % self.modulus]
+
+    def previous_valid(self, stride: int) -> int:
+        """
+        :param stride: a int denoting the stride
+        :returns: the largest valid stride <= stride
+        """
+        while self.gaps[(self.mini + stride) % self.modulus]:
+            stride = stride - 1
+        return stride
+
+    def valid(self, start: int, stop: int) -> Iterator[int]:
+        """
+        :param start: first stride of the range
+        :param stop: end of the range (exclusive)
+        :returns: iterator over the valid strides in the range
+        """
+        stride = self.next_valid(start)
+        while stride < stop:
+            yield stride
+            stride = self.next_valid(stride + 1)
+
+    def score(self, stride: int) -> int:
+        """
+        :param stride: a int denoting the stride
+        :returns: the largest partial quotient of the continued fraction of step / space
+        (lower is better, 1 is the minimum)
+        """
+        step = (self.mini + self.next_valid(stride)) % self.space
+        space = self.space
+        result = 0
+        while step:
+            quotient, remainder = divmod(space, step)
+            result = max(result, quotient)
+            space, step = step, remainder
+        return result
+
+    def rank(self, start: int, stop: int, number: int = 10) -> List[int]:
+        """
+        Scores all valid strides of a range.
+
+        :param start: first stride of the range
+        :param stop: end of the range (exclusive)
+        :param number: how many strides to return
+        :returns: the best valid strides of the range, best first
+        """
+        return sorted(self.valid(start, stop), key=lambda stride: (self.score(stride), stride))[
+            :number
+        ]
+
+    def suggest(self, window: int = 64) -> int:
+        """
+        Suggests a stride with good dispersion: the step closest to the golden section
+        of the space, improved by scoring the valid strides around it.
+
+        :param window: number of strides before and after the golden section to score
+        :returns: a valid stride between 0 and space - 1
+        """
+        # step = space * (sqrt(5) - 1) / 2 in integer arithmetic
+        step = (math.isqrt(5 * self.space * self.space) - self.space) // 2
+        stride = (step - self.mini) % self.space
+        return self.rank(stride - window, stride + window, 1)[0] % self.space
@@ -0,0 +1,240 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Opt-in instrumentation of the Erdi8 methods. While enabled, the public methods of
+the Erdi8 class are replaced by wrappers that record call counts, cumulative time
+and a latency histogram; disabling puts the original methods back, so there is no
+overhead at all when instrumentation is off.
+"""
+
+import functools
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from erdi8.erdi8 import CheckResult, Erdi8
+
+# upper bounds (in seconds) of the latency histogram buckets, the last bucket
+# takes everything above
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+_active: Optional["Instrumentation"] = None
+
+
+def _methods() -> List[str]:
+    """
+    :returns: the names of the public methods of Erdi8.
+    """
+    return [
+        name
+        for name, value in vars(Erdi8).items()
+        if not name.startswith("_") and isinstance(value, types.FunctionType)
+    ]
+
+
+class Instrumentation:
+    """
+    Collects metrics of all Erdi8 objects while enabled (only one Instrumentation can
+    be enabled at a time). Use it as a context manager or call enable and disable.
+
+    Besides the per method metrics there are two counters: "gcd_iterations" counts the
+    stride candidates that were skipped because they are not coprime to the size of
+    the mod space (the distance effective_stride looks up in the coprime gap table,
+    and the other candidates of compute_stride), "check_failures" counts invalid
+    strings detected by check, validate or validate_many. Nested calls (e.g. the
+    check inside decode_int) are measured as well.
+    """
+
+    def __init__(
+        self, methods: Optional[Sequence[str]] = None, buckets: Sequence[float] = BUCKETS
+    ):
+        """
+        Instrumentation Constructor.
+
+        :param methods: names of the Erdi8 methods to instrument, defaults to all public ones.
+        :param buckets: upper bounds of the histogram buckets in seconds.
+        """
+        self.methods = list(methods) if methods is not None else _methods()
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originals: Dict[str, Any] = {}
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def reset(self) -> None:
+        """
+        Sets all metrics to zero.
+        """
+        with self._lock:
+            self._calls = {name: 0 for name in self.methods}
+            self._time = {name: 0.0 for name in self.methods}
+            self._histogram = {name: [0] * (len(self.buckets) + 1) for name in self.methods}
+            self._counters = {"gcd_iterations": 0, "check_failures": 0}
+
+    def enable(self) -> None:
+        """
+        Starts collecting metrics by patching the Erdi8 class.
+        """
+        global _active
+        if _active is self:
+            return
+        if _active is not None:
+            raise ValueError("Error: Another Instrumentation is already enabled.")
+        for name in self.methods:
+            original = vars(Erdi8)[name]
+            self._originals[name] = original
+            setattr(Erdi8, name, self._wrap(name, original))
+        _active = self
+
+    def disable(self) -> None:
+        """
+        Stops collecting metrics and restores the original Erdi8 methods.
+        """
+        global _active
+        if _active is not self:
+            return
+        for name, original in self._originals.items():
+            setattr(Erdi8, name, original)
+        self._originals = {}
+        _active = None
+
+    def __enter__(self) -> "Instrumentation":
+        self.enable()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.disable()
+
+    def _wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        :param name: method name.
+        :param method: the original method.
+        :returns: the instrumented method.
+        """
+        count = self._count(name)
+        local = self._local
+
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            depth = getattr(local, "depth", 0)
+            local.depth = depth + 1
+            start = time.perf_counter()
+            failed = False
+            result = None
+            try:
+                result = method(*args, **kwargs)
+            except ValueError:
+                failed = True
+                raise
+            finally:
+                local.depth = depth
+                self._record(name, time.perf_counter() - start)
+                if count is not None:
+                    count(args, kwargs, result, failed, depth)
+            return result
+
+        return wrapper
+
+    def _count(self, name: str) -> Optional[Callable[..., None]]:
+        """
+        :param name: method name.
+        :returns: function that updates the counters after a call of the method, None
+        if the method doesn't affect the counters.
+        """
+        if name == "effective_stride":
+
+            def count(args: Any, kwargs: Any, result: Any, failed: bool, depth: int) -> None:
+                if result is not None:
+                    stride = kwargs["stride"] if "stride" in kwargs else args[3]
+                    self._add("gcd_iterations", result - stride)
+
+            return count
+        if name == "compute_stride":
+
+            def count(args: Any, kwargs: Any, result: Any, failed: bool, depth: int) -> None:
+                if result is not None:
+                    self._add("gcd_iterations", len(result["stride_other_candidates"]))
+
+            return count
+        if name == "check":
+
+            def count(args: Any, kwargs: Any, result: Any, failed: bool, depth: int) -> None:
+                if failed:
+                    self._add("check_failures", 1)
+
+            return count
+        if name in ("validate", "validate_many"):
+
+            def count(args: Any, kwargs: Any, result: Any, failed: bool, depth: int) -> None:
+                # check uses validate internally, only count calls from outside
+                if depth > 0 or result is None:
+                    return
+                if isinstance(result, CheckResult):
+                    self._add("check_failures", int(result != CheckResult.VALID))
+                elif result and isinstance(result[0], CheckResult):
+                    self._add("check_failures", sum(1 for value in result if value))
+                else:
+                    self._add("check_failures", sum(1 for value in result if not value))
+
+            return count
+        return None
+
+    def _add(self, counter: str, value: int) -> None:
+        with self._lock:
+            self._counters[counter] = self._counters[counter] + value
+
+    def _record(self, name: str, elapsed: float) -> None:
+        bucket = 0
+        for bound in self.buckets:
+            if elapsed <= bound:
+                break
+            bucket = bucket + 1
+        with self._lock:
+            self._calls[name] = self._calls[name] + 1
+            self._time[name] = self._time[name] + elapsed
+            self._histogram[name][bucket] = self._histogram[name][bucket] + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        The current metrics as a plain dict (e.g. to forward them to a metrics system
+        or to serialize them as JSON). Methods that were not called are left out.
+
+        :returns: {"methods": {name: {"calls", "time", "histogram"}}, "counters": {...}}
+        where histogram maps the upper bound of each bucket (as str, "inf" for the
+        last one) to the number of calls.
+        """
+        labels = [str(bound) for bound in self.buckets] + ["inf"]
+        with self._lock:
+            return {
+                "methods": {
+                    name: {
+                        "calls": self._calls[name],
+                        "time": self._time[name],
+                        "histogram": dict(zip(labels, self._histogram[name])),
+                    }
+                    for name in self.methods
+                    if self._calls[name]
+                },
+                "counters": dict(self._counters),
+            }
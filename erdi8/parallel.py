@@ -0,0 +1,256 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Multi-core bulk codec for fixed-width byte records (e.g. 16 byte UUIDs or 32 byte
+hash digests). The input is copied once into a shared memory block, the records
+are split into chunks that worker processes encode (or decode) into a second
+shared memory block of fixed-width output records. Nothing but the chunk
+boundaries is pickled, and the output keeps the input order.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Any, Iterable, List, Optional, Tuple
+
+from erdi8.erdi8 import Erdi8
+
+# strings shorter than the record size of the shared memory block are padded with this
+PAD = "\0"
+
+
+def max_chars(e8: Erdi8, record_size: int) -> int:
+    """
+    :param e8: the Erdi8 object.
+    :param record_size: size of the records in bytes.
+    :returns: the maximum number of characters of an encoded record.
+    """
+    return len(e8.encode_int(2 ** (8 * record_size) - 1))
+
+
+def _encode_chunk(
+    safe: bool,
+    source: str,
+    target: str,
+    record_size: int,
+    chars: int,
+    width: Optional[int],
+    start: int,
+    stop: int,
+) -> None:
+    """
+    Worker task: encodes the records start to stop of the source block into the
+    target block.
+    """
+    e8 = Erdi8.get(safe)
+    source_block = shared_memory.SharedMemory(source)
+    target_block = shared_memory.SharedMemory(target)
+    try:
+        with source_block.buf[start * record_size : stop * record_size] as data:
+            values = e8.encode_many(data, record_size=record_size, width=width)
+        target_block.buf[start * chars : stop * chars] = "".join(
+            value.ljust(chars, PAD) for value in values
+        ).encode("ascii")
+    finally:
+        source_block.close()
+        target_block.close()
+
+
+def _decode_chunk(
+    safe: bool,
+    source: str,
+    target: str,
+    record_size: int,
+    chars: int,
+    width: Optional[int],
+    start: int,
+    stop: int,
+) -> None:
+    """
+    Worker task: decodes the (padded) erdi8 strings start to stop of the source
+    block into records of the target block.
+    """
+    e8 = Erdi8.get(safe)
+    source_block = shared_memory.SharedMemory(source)
+    target_block = shared_memory.SharedMemory(target)
+    try:
+        text = bytes(source_block.buf[start * chars : stop * chars]).decode("ascii")
+        strings = [text[i : i + chars].rstrip(PAD) for i in range(0, len(text), chars)]
+        target_block.buf[start * record_size : stop * record_size] = _pack(
+            e8.decode_many(strings, width), record_size
+        )
+    finally:
+        source_block.close()
+        target_block.close()
+
+
+def _pack(values: Iterable[int], record_size: int) -> bytes:
+    """
+    :param values: decoded values.
+    :param record_size: size of the records in bytes.
+    :returns: the concatenated big-endian records.
+    """
+    try:
+        return b"".join(value.to_bytes(record_size, "big") for value in values)
+    except OverflowError:
+        raise ValueError(f"Error: A value doesn't fit into {record_size} bytes.")
+
+
+def _run(
+    task: Any,
+    e8: Erdi8,
+    data: bytes,
+    output_size: int,
+    record_size: int,
+    chars: int,
+    width: Optional[int],
+    count: int,
+    workers: Optional[int],
+    chunk_size: int,
+    context: Any,
+) -> bytes:
+    """
+    Runs a task on all chunks with a process pool.
+
+    :returns: the content of the output block.
+    """
+    context = context or multiprocessing.get_context()
+    source = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    target = shared_memory.SharedMemory(create=True, size=max(output_size, 1))
+    try:
+        source.buf[: len(data)] = data
+        tasks: List[Tuple[Any, ...]] = [
+            (
+                e8.is_safe,
+                source.name,
+                target.name,
+                record_size,
+                chars,
+                width,
+                start,
+                min(start + chunk_size, count),
+            )
+            for start in range(0, count, chunk_size)
+        ]
+        with context.Pool(workers or os.cpu_count()) as pool:
+            pool.starmap(task, tasks)
+        return bytes(target.buf[:output_size])
+    finally:
+        source.close()
+        source.unlink()
+        target.close()
+        target.unlink()
+
+
+def encode_parallel(
+    e8: Erdi8,
+    records: Any,
+    record_size: int,
+    width: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1 << 16,
+    min_records: int = 1 << 17,
+    context: Any = None,
+) -> List[str]:
+    """
+    Encodes fixed-width big-endian byte records with a process pool. The output is
+    identical to e8.encode_many(records, record_size=record_size, width=width).
+
+    :param e8: the Erdi8 object to encode with.
+    :param records: bytes-like object of concatenated records.
+    :param record_size: size of the records in bytes.
+    :param width: optional fixed width of the results (see encode_int).
+    :param workers: number of worker processes, defaults to the number of CPUs.
+    :param chunk_size: number of records per task.
+    :param min_records: below this number of records, encode in-process.
+    :param context: multiprocessing context, defaults to multiprocessing.get_context().
+    :returns: list of erdi8 values in the order of the records.
+    """
+    data = memoryview(records).cast("B")
+    if record_size < 1 or len(data) % record_size != 0:
+        raise ValueError(
+            f"Error: {len(data)} bytes can't be split into records of size {record_size}."
+        )
+    count = len(data) // record_size
+    if count < min_records or workers == 1:
+        return e8.encode_many(data, record_size=record_size, width=width)
+    chars = width if width is not None else max_chars(e8, record_size)
+    text = _run(
+        _encode_chunk,
+        e8,
+        data,
+        count * chars,
+        record_size,
+        chars,
+        width,
+        count,
+        workers,
+        chunk_size,
+        context,
+    ).decode("ascii")
+    if width is not None:
+        return [text[i : i + chars] for i in range(0, len(text), chars)]
+    return [text[i : i + chars].rstrip(PAD) for i in range(0, len(text), chars)]
+
+
+def decode_parallel(
+    e8: Erdi8,
+    erdi8s: List[str],
+    record_size: int,
+    width: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1 << 16,
+    min_records: int = 1 << 17,
+    context: Any = None,
+) -> bytes:
+    """
+    Decodes erdi8 strings to fixed-width big-endian byte records with a process pool.
+
+    :param e8: the Erdi8 object to decode with.
+    :param erdi8s: list of erdi8 strings.
+    :param record_size: size of the records in bytes.
+    :param width: optional fixed width, decodes keys created with a width.
+    :param workers: number of worker processes, defaults to the number of CPUs.
+    :param chunk_size: number of strings per task.
+    :param min_records: below this number of strings, decode in-process.
+    :param context: multiprocessing context, defaults to multiprocessing.get_context().
+    :returns: the concatenated records in the order of the strings.
+    """
+    count = len(erdi8s)
+    if not count:
+        return b""
+    if count < min_records or workers == 1:
+        return _pack(e8.decode_many(erdi8s, width), record_size)
+    chars = width if width is not None else max(len(value) for value in erdi8s)
+    text = "".join(value.ljust(chars, PAD) for value in erdi8s)
+    if len(text) != count * chars:
+        raise ValueError(f"Error: All values must have a width of {width} characters.")
+    return _run(
+        _decode_chunk,
+        e8,
+        text.encode("ascii"),
+        count * record_size,
+        record_size,
+        chars,
+        width,
+        count,
+        workers,
+        chunk_size,
+        context,
+    )
@@ -0,0 +1,244 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Sorting and reconciliation of (large) collections of erdi8 values.
+
+Shorter erdi8 values always stand for smaller integers, and values of the same
+length sort as text in the same order as their integers (the alphabet is in
+ASCII order). Numeric order is therefore the order by (length, text), nothing
+has to be decoded. sort_file sorts newline-delimited files that don't fit into
+memory (sorted runs on disk plus a k-way merge), audit compares sorted values
+against the expected increment or fancy sequence.
+"""
+
+import heapq
+import itertools
+import os
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypedDict
+
+from erdi8.erdi8 import Erdi8
+from erdi8.fancy import FancyView
+
+CHUNK_LINES = 1 << 20
+FAN_IN = 128
+
+
+class Audit(TypedDict):
+    """
+    Custom type for the result of audit. gaps holds (first, last) of every run of
+    missing values and duplicated every value that occurs more than once, both up
+    to the limit given to audit; missing and duplicates are the full counts.
+    """
+
+    count: int
+    missing: int
+    duplicates: int
+    gaps: List[Tuple[str, str]]
+    duplicated: List[str]
+
+
+def numeric_key(value: str) -> str:
+    """
+    Sort key for the numeric order of erdi8 values. It orders by (length, text) but
+    is a single str (the length as one character in front of the value), which
+    compares considerably faster than a tuple.
+
+    :param value: erdi8 value.
+    :returns: the sort key.
+    """
+    return chr(len(value)) + value
+
+
+def sort_numeric(values: List[str]) -> None:
+    """
+    Sorts a list of erdi8 values into numeric order in place. This is a plain text
+    sort followed by a stable sort by length, both run at C speed.
+
+    :param values: list of erdi8 values.
+    """
+    values.sort()
+    values.sort(key=len)
+
+
+def unique(values: Iterable[Any]) -> Iterator[Any]:
+    """
+    :param values: sorted values.
+    :returns: iterator over the values without (adjacent) duplicates.
+    """
+    return (value for value, _ in itertools.groupby(values))
+
+
+def _sort_chunk(values: List[str], key: Optional[Callable[[str], Any]]) -> None:
+    if key is None or key is numeric_key:
+        sort_numeric(values)
+    else:
+        values.sort(key=key)
+
+
+def _read(path: str) -> Iterator[str]:
+    """
+    :param path: path of a newline-delimited file.
+    :returns: iterator over the non-empty lines without line breaks.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def _write_run(values: Iterable[str], directory: Optional[str]) -> str:
+    """
+    :param values: the values of the run.
+    :param directory: directory of the temporary file.
+    :returns: path of the temporary file.
+    """
+    handle, path = tempfile.mkstemp(prefix="erdi8-run-", suffix=".txt", dir=directory)
+    with os.fdopen(handle, "w") as f:
+        f.writelines(value + "\n" for value in values)
+    return path
+
+
+def sort_file(
+    source: str,
+    target: str,
+    key: Optional[Callable[[str], Any]] = None,
+    deduplicate: bool = False,
+    chunk_lines: int = CHUNK_LINES,
+    fan_in: int = FAN_IN,
+    tmp_dir: Optional[str] = None,
+) -> int:
+    """
+    External merge sort of a newline-delimited file of erdi8 values. The input is
+    read in chunks of chunk_lines values that are sorted in memory and written to
+    temporary files, which are then merged (at most fan_in at a time). Memory use
+    only depends on chunk_lines. Empty lines are dropped.
+
+    :param source: path of the input file.
+    :param target: path of the output file (may be the same as source).
+    :param key: sort key, default: numeric order; use FancyView(...).index to sort
+    into the order of a fancy sequence.
+    :param deduplicate: write every value only once.
+    :param chunk_lines: number of values sorted in memory at a time.
+    :param fan_in: maximum number of files merged at once.
+    :param tmp_dir: directory for the temporary files, default: the system default.
+    :returns: number of values written.
+    """
+    if chunk_lines < 1 or fan_in < 2:
+        raise ValueError(
+            f"Error: chunk_lines must be positive and fan_in at least 2. "
+            f"You provided {chunk_lines} and {fan_in}."
+        )
+    merge_key = numeric_key if key is None else key
+    runs: List[str] = []
+    try:
+        lines = _read(source)
+        while True:
+            chunk = list(itertools.islice(lines, chunk_lines))
+            if not chunk:
+                break
+            _sort_chunk(chunk, key)
+            runs.append(_write_run(unique(chunk) if deduplicate else chunk, tmp_dir))
+        while len(runs) > fan_in:
+            merged = runs[:fan_in]
+            values = heapq.merge(*[_read(run) for run in merged], key=merge_key)
+            runs = runs[fan_in:] + [
+                _write_run(unique(values) if deduplicate else values, tmp_dir)
+            ]
+            for run in merged:
+                os.remove(run)
+        values = heapq.merge(*[_read(run) for run in runs], key=merge_key)
+        count = 0
+        with open(target, "w") as f:
+            for value in unique(values) if deduplicate else values:
+                f.write(value + "\n")
+                count = count + 1
+        return count
+    finally:
+        for run in runs:
+            os.remove(run)
+
+
+def audit(
+    values: Iterable[str],
+    e8: Erdi8,
+    start: Optional[str] = None,
+    stride: Optional[int] = None,
+    last: Optional[str] = None,
+    limit: int = 1000,
+) -> Audit:
+    """
+    Compares sorted erdi8 values with the expected sequence and reports the gaps and
+    duplicates. Without stride the expected sequence is the one of Erdi8.increment
+    (sorted in numeric order, see sort_file), with stride it's the fancy sequence
+    of FancyView(e8, start, stride) (sorted with key=FancyView(...).index).
+
+    :param values: the sorted values, e.g. the lines of a file sorted with sort_file.
+    :param e8: the Erdi8 object.
+    :param start: first expected value, default: the first value of increment;
+    required with a stride.
+    :param stride: stride of a fancy sequence.
+    :param last: last expected value, values missing after the last given one are
+    reported as a gap as well.
+    :param limit: maximum number of gaps and of duplicated values listed.
+    :returns: an Audit dict.
+    """
+    if stride is None:
+        position: Callable[[str], int] = e8.decode_int
+        value_at: Callable[[int], str] = e8.encode_int
+        first = e8.decode_int(start) if start else 0
+    else:
+        if not start:
+            raise ValueError("Error: A start value is required to audit a fancy sequence.")
+        view = FancyView(e8, start, stride)
+        position = view.index
+        value_at = view.__getitem__
+        first = 0
+    result: Audit = {"count": 0, "missing": 0, "duplicates": 0, "gaps": [], "duplicated": []}
+    gaps = result["gaps"]
+    duplicated = result["duplicated"]
+
+    def gap(begin: int, end: int) -> None:
+        # the positions begin to end - 1 are missing
+        if end > begin:
+            result["missing"] = result["missing"] + end - begin
+            if len(gaps) < limit:
+                gaps.append((value_at(begin), value_at(end - 1)))
+
+    expected = first
+    previous = None
+    for value in values:
+        current = position(value)
+        if current < expected - 1 or (previous is None and current < first):
+            raise ValueError(
+                f"Error: {value!r} is not in sequence order or before the start value."
+            )
+        if current == expected - 1 and previous is not None:
+            result["duplicates"] = result["duplicates"] + 1
+            if len(duplicated) < limit and (not duplicated or duplicated[-1] != value):
+                duplicated.append(value)
+        else:
+            gap(expected, current)
+            expected = current + 1
+        previous = value
+        result["count"] = result["count"] + 1
+    if last is not None:
+        gap(expected, position(last) + 1)
+    return result
@@ -0,0 +1,282 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A durable counter that keeps the four parts of a sequence (safe, start, stride
+and how far it got) in a small memory-mapped state file.
+
+Identifiers are reserved in batches: before the first identifier of a batch is
+handed out, a record with the new high-water mark is written and flushed to
+disk. After a crash the counter continues after the high-water mark, i.e. the
+unused rest of the last batch is skipped but no identifier is issued twice.
+The file holds two record slots that are written alternately; each record has
+a sequence number and a checksum, so a torn write never destroys the last
+good record. An existing file without any valid record is rejected instead of
+starting the sequence over.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from erdi8.erdi8 import Erdi8
+from erdi8.fancy import FancySequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+MAGIC = b"erdi8ctr"
+RECORD_SIZE = 2048
+# magic, sequence number, checksum, payload length
+RECORD_HEADER = struct.Struct(">8sQII")
+MAX_PAYLOAD = RECORD_SIZE - RECORD_HEADER.size
+# the checksum covers the sequence number, the payload length and the payload
+CHECKSUM_HEADER = struct.Struct(">QI")
+# stand-in for the high-water mark of plain sequences when the maximum payload
+# size is checked, plain sequences can't practically count beyond it
+MAX_PLAIN_RESERVED = 10**30
+
+
+def _sync_directory(path: str) -> None:
+    """
+    Flushes the directory entry of a (new) file to disk.
+
+    :param path: path of the file.
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories can't be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PersistentCounter(Iterator[str]):
+    """
+    Crash-safe counter for increment (no stride) or increment_fancy (with stride)
+    sequences. It is safe to share between threads of one process; the state file
+    is locked so that no second process can use it at the same time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: Optional[str] = None,
+        stride: Optional[int] = None,
+        safe: Optional[bool] = None,
+        batch_size: int = 1000,
+    ):
+        """
+        PersistentCounter Constructor. If the state file exists, the stored sequence
+        is continued and start, stride and safe (if given) must match it.
+
+        :param path: path of the state file.
+        :param start: start value, the first identifier issued is the one after it.
+        :param stride: a int denoting the stride for fancy sequences.
+        :param safe: whether to use Erdi8(safe=True), defaults to False for new files.
+        :param batch_size: number of identifiers reserved per disk flush.
+        """
+        if batch_size < 1:
+            raise ValueError(f"Error: batch_size must be positive. You provided {batch_size}.")
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.fstat(self._fd).st_size < 2 * RECORD_SIZE:
+                os.ftruncate(self._fd, 2 * RECORD_SIZE)
+            self._map = mmap.mmap(self._fd, 2 * RECORD_SIZE)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        try:
+            # a new file (or one that never got its first record) is all zeros
+            new = not self._map[:].strip(b"\0")
+            self._open(start, stride, safe, new)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(
+        self, start: Optional[str], stride: Optional[int], safe: Optional[bool], new: bool
+    ) -> None:
+        """
+        Loads the stored state (or initializes a new state file).
+        """
+        record = self._read()
+        if record is None:
+            if not new:
+                # starting over would issue identifiers a second time
+                raise ValueError(f"Error: {self.path} doesn't contain a valid record.")
+            record = {"safe": bool(safe), "start": start or "", "stride": stride, "reserved": 0}
+            self._sequence = 0
+        else:
+            given = {"safe": safe, "start": start, "stride": stride}
+            for key, value in given.items():
+                if value is not None and value != record[key]:
+                    raise ValueError(
+                        f"Error: {self.path} holds a sequence with {key}={record[key]!r}, "
+                        f"you provided {value!r}."
+                    )
+        self.safe = record["safe"]
+        self.start = record["start"]
+        self.stride = record["stride"]
+        self.e8 = Erdi8.get(self.safe)
+        # everything up to the stored high-water mark may have been issued before
+        self.issued = self.reserved = record["reserved"]
+        if self.stride is None:
+            self._value = (self.e8.decode_int(self.start) if self.start else -1) + self.issued
+            self._capacity = None
+        else:
+            self._fancy = FancySequence(self.e8, self.start, self.stride)
+            self._fancy.skip(self.issued)
+            self._capacity = self._fancy.space - 1
+        maximum = MAX_PLAIN_RESERVED if self._capacity is None else self._capacity
+        if len(self._payload(maximum)) > MAX_PAYLOAD:
+            raise ValueError(
+                f"Error: The start value and the stride don't fit into a record of "
+                f"{MAX_PAYLOAD} bytes."
+            )
+        if self._sequence == 0:
+            self._write()
+            # make the size of the new file and its directory entry durable, otherwise
+            # the file can vanish in a crash and the sequence would start over
+            os.fsync(self._fd)
+            _sync_directory(self.path)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """
+        :returns: the payload of the newest valid record, None if there is none.
+        """
+        best = None
+        for slot in range(2):
+            offset = slot * RECORD_SIZE
+            magic, sequence, checksum, size = RECORD_HEADER.unpack_from(self._map, offset)
+            start = offset + RECORD_HEADER.size
+            payload = self._map[start : start + size]
+            if (
+                magic == MAGIC
+                and size <= MAX_PAYLOAD
+                and zlib.crc32(payload, zlib.crc32(CHECKSUM_HEADER.pack(sequence, size)))
+                == checksum
+                and (best is None or sequence > best[0])
+            ):
+                best = (sequence, payload)
+        if best is None:
+            return None
+        self._sequence = best[0]
+        return json.loads(best[1])
+
+    def _payload(self, reserved: int) -> bytes:
+        """
+        :param reserved: the high-water mark.
+        :returns: the payload of a record.
+        """
+        return json.dumps(
+            {"safe": self.safe, "start": self.start, "stride": self.stride, "reserved": reserved}
+        ).encode("ascii")
+
+    def _write(self) -> None:
+        """
+        Writes the current state to the older record slot and flushes it to disk.
+        """
+        payload = self._payload(self.reserved)
+        if len(payload) > MAX_PAYLOAD:
+            raise ValueError(f"Error: The state doesn't fit into a record of {MAX_PAYLOAD} bytes.")
+        sequence = self._sequence + 1
+        checksum = zlib.crc32(payload, zlib.crc32(CHECKSUM_HEADER.pack(sequence, len(payload))))
+        offset = (sequence % 2) * RECORD_SIZE
+        self._sequence = sequence
+        RECORD_HEADER.pack_into(self._map, offset, MAGIC, sequence, checksum, len(payload))
+        self._map[offset + RECORD_HEADER.size : offset + RECORD_HEADER.size + len(payload)] = payload
+        self._map.flush()
+
+    def _reserve(self, number: int) -> None:
+        """
+        Makes sure that at least number more identifiers are reserved on disk.
+
+        :param number: how many identifiers are about to be issued
+        """
+        if self._capacity is not None and self.issued + number > self._capacity:
+            raise ValueError("Error: The mod space is exhausted.")
+        if self.issued + number <= self.reserved:
+            return
+        reserved = self.issued + max(number, self.batch_size)
+        if self._capacity is not None:
+            reserved = min(reserved, self._capacity)
+        self.reserved = reserved
+        self._write()
+
+    @property
+    def current(self) -> str:
+        """
+        The last issued erdi8 value (after a restart: the last one that may have
+        been issued).
+        """
+        if self._capacity is None:
+            return self.e8.encode_int(self._value) if self._value >= 0 else ""
+        return self._fancy.current
+
+    def __iter__(self) -> "PersistentCounter":
+        return self
+
+    def __next__(self) -> str:
+        return self.next_n(1)[0]
+
+    def next_n(self, number: int) -> List[str]:
+        """
+        Issues the next number values of the sequence.
+
+        :param number: how many values to issue
+        :returns: list of the next erdi8 values
+        """
+        with self._lock:
+            self._reserve(number)
+            self.issued = self.issued + number
+            if self._capacity is not None:
+                return self._fancy.next_n(number)
+            first = self._value + 1
+            self._value = self._value + number
+            return [self.e8.encode_int(value) for value in range(first, self._value + 1)]
+
+    def close(self) -> None:
+        """
+        Closes the state file. Unused reserved identifiers are skipped when the
+        counter is opened again.
+        """
+        if self._fd < 0:
+            return
+        self._map.close()
+        os.close(self._fd)
+        self._fd = -1
+
+    def __enter__(self) -> "PersistentCounter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
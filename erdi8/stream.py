@@ -0,0 +1,208 @@
+#    erdi8 -  a unique identifier scheme and identifier generator and transformer
+#    that operates on the base-36 alphabet without [0, 1, and l]
+#
+#    Copyright (C) 2021  Andreas Thalhammer
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Streaming version of the four byte codec (see Erdi8.encode_four_bytes). Every
+4 bytes of the input become 7 characters of output, exactly like
+encode_four_bytes. A trailing chunk of 1 to 3 bytes is encoded into a value
+of the length 7 mod space that lies beyond 2^32 (four byte chunks never use
+these values), so that it can be told apart from a full chunk when decoding.
+"""
+
+import io
+import struct
+from typing import Any, Iterator, List
+
+from erdi8.erdi8 import Erdi8
+
+CHUNK_BYTES = 4
+CHUNK_CHARS = 7
+# start of the values for trailing chunks of 1, 2 and 3 bytes
+PARTIAL_BASE = {1: 2**32, 2: 2**32 + 2**8, 3: 2**32 + 2**8 + 2**16}
+WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+def _blocks(source: Any, block_size: int) -> Iterator[Any]:
+    """
+    Reads the source in blocks. All blocks but the last one have a size that is a
+    multiple of the chunk size of the data (4 bytes or 7 characters).
+
+    :param source: bytes-like object, str, or readable file-like object.
+    :param block_size: approximate size of the blocks.
+    :returns: iterator over the blocks.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, str)):
+        view = source if isinstance(source, str) else memoryview(source).cast("B")
+        for i in range(0, len(view), block_size):
+            yield view[i : i + block_size]
+        return
+    pending = None
+    while True:
+        data = source.read(block_size)
+        if not data:
+            break
+        if pending:
+            data = pending + data
+        chunk = CHUNK_CHARS if isinstance(data, str) else CHUNK_BYTES
+        cut = len(data) - len(data) % chunk
+        pending = data[cut:]
+        if cut:
+            yield data[:cut]
+    if pending:
+        yield pending
+
+
+def iter_encode(
+    e8: Erdi8, source: Any, block_size: int = 1 << 16
+) -> Iterator[str]:
+    """
+    Encodes bytes to erdi8 chunks of length 7, reading and producing large blocks at
+    a time.
+
+    :param e8: the Erdi8 object to encode with.
+    :param source: bytes, bytearray, memoryview, or a readable binary file-like object.
+    :param block_size: number of bytes to process at a time (rounded to a multiple of 4).
+    :returns: iterator over blocks of concatenated erdi8 chunks.
+    """
+    block_size = max(block_size - block_size % CHUNK_BYTES, CHUNK_BYTES)
+    blocks = e8.blocks
+    lead = e8.alph[e8.OFFSET :]
+    cube = e8.alph_len**3
+    for block in _blocks(source, block_size):
+        full = len(block) // CHUNK_BYTES
+        parts = []
+        for value in struct.unpack(f">{full}I", block[: full * CHUNK_BYTES]):
+            high, low = divmod(value, cube)
+            first, middle = divmod(high, cube)
+            parts.append(lead[first] + blocks[middle] + blocks[low])
+        rest = len(block) - full * CHUNK_BYTES
+        if rest:
+            value = PARTIAL_BASE[rest] + int.from_bytes(block[-rest:], "big")
+            high, low = divmod(value, cube)
+            first, middle = divmod(high, cube)
+            parts.append(lead[first] + blocks[middle] + blocks[low])
+        yield "".join(parts)
+
+
+def encode_stream(
+    e8: Erdi8, source: Any, sink: Any, block_size: int = 1 << 16
+) -> int:
+    """
+    Encodes bytes from source and writes the erdi8 chunks to sink.
+
+    :param e8: the Erdi8 object to encode with.
+    :param source: bytes, bytearray, memoryview, or a readable binary file-like object.
+    :param sink: writable text or binary file-like object.
+    :param block_size: number of bytes to process at a time.
+    :returns: number of characters written.
+    """
+    text = isinstance(sink, io.TextIOBase)
+    written = 0
+    for block in iter_encode(e8, source, block_size):
+        sink.write(block if text else block.encode("ascii"))
+        written = written + len(block)
+    return written
+
+
+def iter_decode(
+    e8: Erdi8, source: Any, block_size: int = 7 << 14
+) -> Iterator[bytes]:
+    """
+    Decodes erdi8 chunks of length 7 back to bytes, reading large blocks at a time.
+    Whitespace (e.g. line breaks) in the input is ignored.
+
+    :param e8: the Erdi8 object to decode with.
+    :param source: str, bytes-like object, or a readable text or binary file-like object.
+    :param block_size: number of characters to process at a time.
+    :returns: iterator over blocks of decoded bytes.
+    """
+    delete = str.maketrans("", "", e8.alph)
+    first_digit = e8.OFFSET * e8.alph_len ** (CHUNK_CHARS - 1)
+    pending = ""
+    done = False
+    for block in _blocks(source, block_size):
+        if not isinstance(block, str):
+            block = bytes(block).decode("ascii")
+        block = pending + block.translate(WHITESPACE)
+        if block.translate(delete):
+            e8.check(block)
+        if done and block:
+            raise ValueError("Error: Found data after a trailing partial chunk.")
+        cut = len(block) - len(block) % CHUNK_CHARS
+        pending = block[cut:]
+        digits = block[:cut].translate(e8.digit_table)
+        values = [
+            int(digits[i : i + CHUNK_CHARS], e8.alph_len) - first_digit
+            for i in range(0, cut, CHUNK_CHARS)
+        ]
+        result = _pack(e8, values)
+        if len(result) % CHUNK_BYTES:
+            done = True
+        yield result
+    if pending:
+        raise ValueError(
+            f"Error: We only decode 7 characters at at time. {len(pending)} characters are left."
+        )
+
+
+def _pack(e8: Erdi8, values: List[int]) -> bytes:
+    """
+    Converts decoded chunk values to bytes.
+
+    :param e8: the Erdi8 object (for error messages).
+    :param values: values in the length 7 mod space.
+    :returns: the bytes of the chunks.
+    """
+    if values and min(values) < 0:
+        raise ValueError("Error: Not a valid erdi8 chunk, starts with a number.")
+    full = 0
+    for value in values:
+        if value >= 2**32:
+            break
+        full = full + 1
+    result = struct.pack(f">{full}I", *values[:full])
+    if full == len(values):
+        return result
+    if full != len(values) - 1:
+        raise ValueError("Error: Found data after a trailing partial chunk.")
+    value = values[-1]
+    for size in (3, 2, 1):
+        if PARTIAL_BASE[size] <= value < PARTIAL_BASE[size] + 2 ** (8 * size):
+            return result + (value - PARTIAL_BASE[size]).to_bytes(size, "big")
+    raise ValueError(
+        f"Error: '{e8.encode_int(value + e8.decode_int('zzzzzz') + 1)}' is not a valid chunk."
+    )
+
+
+def decode_stream(
+    e8: Erdi8, source: Any, sink: Any, block_size: int = 7 << 14
+) -> int:
+    """
+    Decodes erdi8 chunks from source and writes the bytes to sink.
+
+    :param e8: the Erdi8 object to decode with.
+    :param source: str, bytes-like object, or a readable text or binary file-like object.
+    :param sink: writable binary file-like object.
+    :param block_size: number of characters to process at a time.
+    :returns: number of bytes written.
+    """
+    written = 0
+    for block in iter_decode(e8, source, block_size):
+        sink.write(block)
+        written = written + len(block)
+    return written
@@ -40,5 +40,7 @@ setup(
         'Topic :: Other/Nonlisted Topic',
     ],
     python_requires='>=3.8',
-    install_requires=[]
+    install_requires=[],
+    extras_require={"numpy": ["numpy"]},
+    entry_points={"console_scripts": ["erdi8=erdi8.cli:main"]},
 )
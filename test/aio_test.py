@@ -0,0 +1,106 @@
+import unittest
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from erdi8 import Erdi8, FancySequence
+from erdi8.aio import AsyncSequence
+
+
+class Store:
+    """
+    In-process stand-in for a persistence layer: records the high-water mark of
+    every reserved batch and can be made to fail or to block.
+    """
+
+    def __init__(self):
+        self.marks = []
+        self.fail = False
+        self.open = asyncio.Event()
+        self.open.set()
+
+    async def reserve(self, batch):
+        await self.open.wait()
+        if self.fail:
+            raise OSError("disk full")
+        self.marks.append(batch[-1])
+
+
+class AioTest(unittest.TestCase):
+    def test_matches_increment_fancy(self):
+        e8 = Erdi8(safe=True)
+        stride = random.randint(0, 10**20)
+
+        async def run():
+            store = Store()
+            async with AsyncSequence(
+                FancySequence(e8, "b222222222", stride), batch_size=64, reserve=store.reserve
+            ) as ids:
+                values = [await ids.next() for _ in range(100)]
+                values = values + await ids.next_n(100)
+                async for value in ids:
+                    values.append(value)
+                    if len(values) == 300:
+                        break
+            return values, store.marks
+
+        values, marks = asyncio.run(run())
+        current = "b222222222"
+        for value in values:
+            current = e8.increment_fancy(current, stride)
+            self.assertEqual(value, current)
+        # every value handed out was reserved before
+        self.assertGreaterEqual(len(marks) * 64, 300)
+        self.assertIn(values[255], marks)
+
+    def test_backpressure(self):
+        e8 = Erdi8()
+
+        async def run():
+            sequence = FancySequence(e8, "b222", 12345)
+            ids = AsyncSequence(sequence, batch_size=10, buffer_size=30)
+            first = await ids.next()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            # the consumer stalls, the buffer is full and the source is not advanced
+            self.assertEqual(ids.buffered, 29)
+            position = sequence.position
+            for _ in range(10):
+                await asyncio.sleep(0)
+            self.assertEqual(sequence.position, position)
+            await ids.next_n(20)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            self.assertEqual(ids.buffered, 29)
+            await ids.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(run()), e8.increment_fancy("b222", 12345))
+
+    def test_errors_and_chunks(self):
+        e8 = Erdi8()
+
+        async def run():
+            store = Store()
+            ids = AsyncSequence(FancySequence(e8, "b222", 7), batch_size=5, reserve=store.reserve)
+            await ids.next_n(5)
+            store.fail = True
+            with self.assertRaises(OSError):
+                await ids.next_n(10)
+            await ids.aclose()
+            values = []
+            with ThreadPoolExecutor(2) as executor:
+                for chunk in AsyncSequence.chunks(e8, 2, 7, 4, batch_size=16, executor=executor):
+                    async for value in chunk:
+                        values.append(value)
+            return values
+
+        values = asyncio.run(run())
+        space = e8.mod_space(2)[2]
+        # the chunk start values count as issued
+        self.assertEqual(len(values), space - 4)
+        self.assertEqual(len(set(values)), len(values))
+        self.assertRaises(ValueError, AsyncSequence, iter([]), 10, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
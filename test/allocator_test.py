@@ -0,0 +1,99 @@
+import unittest
+import multiprocessing
+import os
+import random
+import threading
+from erdi8 import Erdi8
+from erdi8.allocator import BlockAllocator
+
+
+def _take(allocator, number, queue):
+    ids = allocator.ids()
+    queue.put([next(ids) for _ in range(number)])
+    ids.close()
+
+
+def _die(allocator):
+    lease = allocator.lease()
+    next(lease)
+    os._exit(0)
+
+
+class AllocatorTest(unittest.TestCase):
+    def test_plain_matches_increment(self):
+        e8 = Erdi8()
+        allocator = BlockAllocator(e8, "erdi8", block_size=7)
+        current = "erdi8"
+        expected = []
+        for _ in range(20):
+            current = e8.increment(current)
+            expected.append(current)
+        ids = allocator.ids()
+        self.assertEqual([next(ids) for _ in range(20)], expected)
+        self.assertEqual(next(BlockAllocator(e8).lease()), "a")
+
+    def test_fancy_matches_increment_fancy(self):
+        e8 = Erdi8(safe=True)
+        stride = random.randint(0, 100000000000000000000000)
+        allocator = BlockAllocator(e8, "rd8", stride, block_size=1000)
+        current = "rd8"
+        expected = []
+        for _ in range(20 * 28 * 28 - 1):
+            current = e8.increment_fancy(current, stride)
+            expected.append(current)
+        ids = allocator.ids()
+        self.assertEqual([next(ids) for _ in expected], expected)
+        self.assertRaises(ValueError, next, ids)
+
+    def test_release_reuses_rest(self):
+        allocator = BlockAllocator(Erdi8(), block_size=10)
+        with allocator.lease() as lease:
+            first = [next(lease) for _ in range(3)]
+        self.assertEqual(allocator.stats()["returned"], 7)
+        again = list(allocator.lease())
+        self.assertEqual(len(again), 7)
+        self.assertFalse(set(first) & set(again))
+        self.assertEqual(allocator.stats()["reserved"], 10)
+
+    def test_threads(self):
+        allocator = BlockAllocator(Erdi8(), block_size=50)
+        results = []
+
+        def work():
+            ids = allocator.ids()
+            results.append([next(ids) for _ in range(1234)])
+            ids.close()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        issued = [i for result in results for i in result]
+        self.assertEqual(len(set(issued)), 8 * 1234)
+
+    def test_processes(self):
+        context = multiprocessing.get_context()
+        allocator = BlockAllocator(Erdi8(), block_size=100, context=context)
+        queue = context.Queue()
+        processes = [
+            context.Process(target=_take, args=(allocator, 1000, queue)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        issued = [i for _ in processes for i in queue.get()]
+        for process in processes:
+            process.join()
+        self.assertEqual(len(set(issued)), 4000)
+
+    def test_reclaim(self):
+        allocator = BlockAllocator(Erdi8(), block_size=100)
+        process = multiprocessing.get_context().Process(target=_die, args=(allocator,))
+        process.start()
+        process.join()
+        abandoned = allocator.reclaim()
+        self.assertEqual(len(abandoned), 1)
+        self.assertEqual(abandoned[0]["first"], "a")
+        self.assertEqual(abandoned[0]["count"], 100)
+        self.assertEqual(allocator.stats()["abandoned"], 100)
+        self.assertEqual(next(allocator.lease()), Erdi8().encode_int(100))
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from erdi8 import Erdi8
+from erdi8.cli import main
+
+
+class CliTest(unittest.TestCase):
+    def run_cli(self, argv, stdin=""):
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(stdin)):
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                status = main(argv + ["--block-lines", "3"])
+        return status, out.getvalue(), err.getvalue()
+
+    def test_encode_decode(self):
+        e8 = Erdi8(safe=True)
+        values = [0, 1, 25, 6545185, 2**64, 2**200]
+        text = "".join(f"{value}\n" for value in values)
+        status, out, err = self.run_cli(["encode", "--safe"], text)
+        self.assertEqual(status, 0)
+        self.assertEqual(out.split(), [e8.encode_int(value) for value in values])
+        self.assertIn("6 values", err)
+        status, back, _ = self.run_cli(["decode", "--safe", "-q"], out)
+        self.assertEqual(back, text)
+
+    def test_files_and_hex(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ids.txt")
+            with open(path, "w") as f:
+                f.write("0xff\n\n6ba7b810-9dad-11d1-80b4-00c04fd430c8\n")
+            status, out, _ = self.run_cli(["hex", "-q", path, path])
+        e8 = Erdi8()
+        expected = e8.encode_int(255) + "\n\n"
+        expected = expected + e8.encode_int(0x6BA7B8109DAD11D180B400C04FD430C8) + "\n"
+        self.assertEqual(out, expected * 2)
+        for value in ("-ff", "+ff", "f-f", "0x-ff", "f_f", "0x"):
+            status, _, err = self.run_cli(["hex", "-q"], value + "\n")
+            self.assertEqual(status, 1)
+            self.assertIn("line 1", err)
+
+    def test_csv(self):
+        text = 'name,id\nx,25\n"y,z",6545185\n'
+        status, out, _ = self.run_cli(["encode", "--csv", "--header", "--column", "id", "-q"], text)
+        self.assertEqual(out, 'name,id\nx,a2\n"y,z",erdi8\n')
+        status, out, _ = self.run_cli(["decode", "--csv", "--column", "1", "-q"], "x,a2\n")
+        self.assertEqual(out, "x,25\n")
+        for command in ("decode", "check"):
+            status, out, err = self.run_cli(
+                [command, "--csv", "--column", "1", "-q"], "x,a2\nx,b2\ny\nz,c2\n"
+            )
+            self.assertEqual(status, 1)
+            self.assertIn("line 3", err)
+
+    def test_invalid(self):
+        status, out, err = self.run_cli(["check", "-q"], "ab\n2b\nerdi8\nl8\n")
+        self.assertEqual(status, 1)
+        self.assertEqual([line.split("\t")[:2] for line in out.splitlines()], [["2", "2b"], ["4", "l8"]])
+        status, out, err = self.run_cli(["decode", "-q"], "ab\n\nc\nd\nx!\n")
+        self.assertEqual(status, 1)
+        self.assertIn("line 5", err)
+        for value in ("1_000", "+5", "-5", "0x5"):
+            status, _, err = self.run_cli(["encode", "-q", "--csv"], f"{value}\n")
+            self.assertEqual(status, 1)
+            self.assertIn("not a decimal integer", err)
+        status, _, err = self.run_cli(["encode", "-q", "--csv"], " 5\n")
+        self.assertEqual(status, 1)
+        status, _, err = self.run_cli(["decode", "-q"], "b\nb\u00e9\n")
+        self.assertEqual(status, 1)
+        self.assertIn("line 2: Error: ", err)
+
+    def test_fancy(self):
+        e8 = Erdi8(safe=True)
+        status, out, _ = self.run_cli(["fancy", "b222222222", "30321718760514", "--count", "7", "--safe", "-q"])
+        current, expected = "b222222222", []
+        for _ in range(7):
+            current = e8.increment_fancy(current, 30321718760514)
+            expected.append(current)
+        self.assertEqual(out.split(), expected)
+        status, _, err = self.run_cli(["fancy", "b2", "1", "--count", "1000"])
+        self.assertEqual(status, 1)
+
+    def test_broken_pipe(self):
+        command = [sys.executable, "-m", "erdi8", "fancy", "b222", "5", "--count", "100000"]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=root
+        )
+        self.assertEqual(len(process.stdout.readline()), 5)
+        process.stdout.close()
+        _, err = process.communicate()
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(err, b"")
@@ -0,0 +1,37 @@
+import unittest
+import random
+from erdi8 import Erdi8, Erdi8Counter
+
+
+class CounterTest(unittest.TestCase):
+    def test_matches_increment(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            for start in (None, "", e8.alph[e8.OFFSET], "z", "zz", "b2zzy", "erdi8" if not flag else "rdz8"):
+                counter = Erdi8Counter(e8, start)
+                current = start
+                for value in counter.next_n(3000) + [next(counter)]:
+                    current = e8.increment(current)
+                    self.assertEqual(value, current)
+                self.assertEqual(counter.current, current)
+                self.assertEqual(bytes(counter), current.encode())
+                self.assertEqual(len(counter), len(current))
+                self.assertEqual(int(counter), e8.decode_int(current))
+            self.assertEqual(int(Erdi8Counter(e8)), -1)
+            self.assertRaises(ValueError, Erdi8Counter, e8, "2b")
+
+    def test_advance(self):
+        e8 = Erdi8(safe=True)
+        counter = Erdi8Counter(e8, "b222")
+        current = "b222"
+        for number in (0, 1, 2, 33, 1000, random.randint(0, 10**30)):
+            counter.advance(number)
+            current = e8.encode_int(e8.decode_int(current) + number)
+            self.assertEqual(str(counter), current)
+            self.assertEqual(next(counter), e8.increment(current))
+            current = e8.increment(current)
+        self.assertRaises(ValueError, counter.advance, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
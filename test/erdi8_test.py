@@ -1,7 +1,17 @@
 import unittest
 import random
 import math
+import os
+import pickle
+import threading
+import uuid
 from erdi8 import Erdi8
+from erdi8.erdi8 import CheckResult
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class E8Test(unittest.TestCase):
@@ -200,3 +210,267 @@ class E8Test(unittest.TestCase):
         e8.encode_four_bytes([12, 12, 12, 12])
         e8.encode_four_bytes(bytes("asdf", "utf-8"))
         e8.encode_four_bytes(b"\xaa\xee\x00\xff")
+
+    def test_encode_decode_many(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            values = [random.randint(0, 2**64 - 1) >> random.randint(0, 63) for _ in range(1000)]
+            values += [0, 24, 25, 2**64 - 1]
+            expected = [e8.encode_int(v) for v in values]
+            self.assertEqual(e8.encode_many(values), expected)
+            records = b"".join(v.to_bytes(8, "big") for v in values)
+            self.assertEqual(e8.encode_many(records, record_size=8), expected)
+            self.assertEqual(e8.decode_many(expected), values)
+        self.assertRaises(ValueError, e8.encode_many, b"abc", 2)
+        self.assertRaises(ValueError, e8.encode_many, [1, -1])
+        self.assertRaises(ValueError, e8.decode_many, ["b", "2b"])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_encode_decode_many_numpy(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            values = np.random.randint(0, 2**63 - 1, 1000, dtype=np.int64)
+            values >>= np.random.randint(0, 63, 1000)
+            expected = [e8.encode_int(int(v)) for v in values]
+            self.assertEqual(e8.encode_many(values), expected)
+            self.assertEqual(e8.encode_many(values.astype(np.uint64)), expected)
+            self.assertEqual(e8.decode_many(np.array(expected)), values.tolist())
+            records = values.astype(np.uint32).astype(">u4").tobytes()
+            self.assertEqual(
+                e8.encode_many(records, record_size=4),
+                [e8.encode_int(int(v)) for v in values.astype(np.uint32)],
+            )
+        self.assertRaises(ValueError, e8.encode_many, np.array([1, -1]))
+
+    @staticmethod
+    def digit_by_digit_encode(e8, div):
+        # the original encode_int, one character per iteration
+        result = ""
+        mod = div % e8.alph_len
+        div = div // e8.alph_len
+        if mod + e8.OFFSET > e8.alph_len - 1:
+            div = div + 1
+        mod = mod + e8.OFFSET
+        while div >= 1:
+            div = div - 1
+            result = e8.alph[mod % e8.alph_len] + result
+            mod = div % e8.alph_len
+            div = div // e8.alph_len
+            if mod + e8.OFFSET > e8.alph_len - 1:
+                div = div + 1
+            mod = mod + e8.OFFSET
+        return e8.alph[mod % e8.alph_len] + result
+
+    @staticmethod
+    def digit_by_digit_decode(e8, erdi8):
+        # the original decode_int, one character per iteration
+        result = 0
+        counter = 0
+        while erdi8:
+            tail = erdi8[-1]
+            erdi8 = erdi8[:-1]
+            result = (
+                result
+                + (e8.alph_map[tail] + 1) * (e8.alph_len**counter)
+                - e8.OFFSET * e8.alph_len**counter
+            )
+            counter = counter + 1
+        return int(result - 1)
+
+    def test_digit_by_digit(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            values = [random.getrandbits(random.randint(1, 130)) for _ in range(3000)]
+            values += list(range(-50, 2000))
+            for value in values:
+                encoded = e8.encode_int(value)
+                self.assertEqual(encoded, self.digit_by_digit_encode(e8, value))
+                if value >= 0:
+                    self.assertEqual(e8.decode_int(encoded), value)
+                    self.assertEqual(self.digit_by_digit_decode(e8, encoded), value)
+
+    def test_large_values(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            values = [random.getrandbits(random.randint(1, 5000)) for _ in range(50)]
+            # values around the length boundaries
+            for length in range(1, 300, 7):
+                mini, maxi, _ = e8.mod_space(length)
+                values += [mini, maxi, maxi + 1]
+            for value in values:
+                encoded = e8.encode_int(value)
+                self.assertEqual(encoded, self.digit_by_digit_encode(e8, value))
+                self.assertEqual(e8.decode_int(encoded), value)
+                self.assertEqual(self.digit_by_digit_decode(e8, encoded), value)
+
+    def test_fixed_width(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            for width in (1, 3, 7, 12, 20):
+                _, _, space = e8.mod_space(width)
+                values = sorted(random.randrange(space) for _ in range(200))
+                values = [0] + values + [space - 1]
+                keys = [e8.encode_int(v, width=width) for v in values]
+                self.assertTrue(all(len(k) == width for k in keys))
+                self.assertEqual(keys, sorted(keys))
+                self.assertEqual([e8.decode_int(k, width=width) for k in keys], values)
+                self.assertEqual(e8.encode_many(values, width=width), keys)
+                self.assertEqual(e8.decode_many(keys, width=width), values)
+                self.assertRaises(ValueError, e8.encode_int, space, width=width)
+                self.assertRaises(ValueError, e8.encode_int, -1, width=width)
+            self.assertRaises(ValueError, e8.decode_int, "abc", width=4)
+            self.assertRaises(ValueError, e8.decode_many, ["bcd", "bc"], width=3)
+        # the four byte codec uses fixed-width keys of width 7
+        self.assertEqual(
+            e8.encode_int(int.from_bytes(b"erdi", "big"), width=7),
+            e8.encode_four_bytes(b"erdi"),
+        )
+
+    def test_validate_many(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+            strings = [
+                "".join(random.choice(chars) for _ in range(random.randint(0, 8)))
+                for _ in range(2000)
+            ]
+            expected = []
+            for string in strings:
+                try:
+                    e8.check(string)
+                    expected.append(CheckResult.VALID)
+                except ValueError as error:
+                    self.assertEqual(str(error), str(e8.check_error(string)))
+                    if "starts with" in str(error):
+                        expected.append(CheckResult.STARTS_WITH_NUMBER)
+                    else:
+                        expected.append(CheckResult.UNKNOWN_CHARACTER)
+            mask = [code == CheckResult.VALID for code in expected]
+            self.assertEqual(e8.validate_many(strings, reasons=True), expected)
+            self.assertEqual(e8.validate_many(strings), mask)
+            self.assertEqual(e8.validate_many([s.encode() for s in strings]), mask)
+            self.assertEqual(
+                e8.invalid_indices(strings), [i for i, ok in enumerate(mask) if not ok]
+            )
+            if np is not None:
+                self.assertEqual(e8.validate_many(np.array(strings), reasons=True), expected)
+            self.assertIsNone(e8.check_error("b"))
+            self.assertEqual(e8.validate_many([None, 25, "b", b""]), [False, False, True, True])
+            self.assertEqual(
+                e8.validate_many([None], reasons=True), [CheckResult.NOT_A_STRING]
+            )
+            self.assertIn("not a string", str(e8.check_error(None)))
+            self.assertRaises(TypeError, e8.check, None)
+            self.assertRaises(TypeError, e8.decode_int, None)
+            self.assertRaises(TypeError, e8.decode_many, ["b", None])
+
+    def test_fixed_size_codecs(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            for size in (12, 16, 20, 32, 48, 64):
+                width = e8.fixed_width(size)
+                self.assertLess(e8.mod_space(width - 1)[2], 256**size)
+                self.assertGreaterEqual(e8.mod_space(width)[2], 256**size)
+                digests = [bytes(size), b"\xff" * size] + [os.urandom(size) for _ in range(50)]
+                encoded = e8.encode_digests(digests)
+                self.assertEqual(
+                    encoded, [e8.encode_int(int.from_bytes(d, "big")) for d in digests]
+                )
+                self.assertEqual(e8.decode_digests(encoded, size), digests)
+                fixed = e8.encode_digests(digests, fixed=True)
+                self.assertEqual({len(value) for value in fixed}, {width})
+                self.assertEqual(
+                    sorted(fixed), e8.encode_digests(sorted(digests), fixed=True)
+                )
+                self.assertEqual(e8.decode_digests(fixed, size, fixed=True), digests)
+            self.assertRaises(ValueError, e8.decode_digest, e8.encode_int(2**128), 16)
+            uuids = [uuid.uuid4() for _ in range(50)]
+            self.assertEqual(e8.encode_uuids(uuids), [e8.encode_int(u.int) for u in uuids])
+            self.assertEqual(e8.decode_uuids(e8.encode_uuids(uuids)), uuids)
+            self.assertEqual(e8.decode_uuids(e8.encode_uuids(uuids, True), True), uuids)
+            self.assertRaises(ValueError, e8.decode_uuid, e8.encode_int(2**128))
+            xid = [100, 144, 152, 133, 98, 39, 69, 106, 189, 98, 39, 93]
+            self.assertEqual(e8.decode_xid(e8.encode_xid(xid)), bytes(xid))
+            self.assertEqual(e8.decode_xids(e8.encode_xids([xid], True), True), [bytes(xid)])
+            self.assertRaises(ValueError, e8.encode_xid, bytes(11))
+        self.assertEqual(Erdi8().encode_xid(xid), "op34e9rackpsch39few")
+
+    def test_bytes_api(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            buffer = bytearray(b"." * 512)
+            offset = 0
+            values = [0, 1, 24, 25, 6545185, 2**64, 2**128 - 1, 2**1000]
+            for value in values:
+                self.assertEqual(e8.encode_int_bytes(value), e8.encode_int(value).encode())
+                offset = e8.encode_int_into(value, buffer, offset)
+                buffer[offset] = ord(" ")
+                offset = offset + 1
+            self.assertEqual(
+                bytes(buffer[: offset - 1]), " ".join(e8.encode_many(values)).encode()
+            )
+            view = memoryview(buffer)
+            start = 0
+            for value in values:
+                end = buffer.index(b" ", start)
+                self.assertEqual(e8.decode_int_bytes(view[start:end]), value)
+                start = end + 1
+            self.assertEqual(e8.encode_int_into(25, view, 10, width=4), 14)
+            self.assertEqual(e8.decode_int_bytes(buffer[10:14], width=4), 25)
+            self.assertRaises(ValueError, e8.encode_int_into, 2**64, bytearray(5))
+            self.assertEqual(len(buffer), 512)
+            current = e8.alph[e8.OFFSET:]
+            for _ in range(2000):
+                self.assertEqual(
+                    e8.increment_bytes(current.encode()), e8.increment(current).encode()
+                )
+                current = e8.increment(current)
+            self.assertEqual(e8.increment_bytes(b"zzz"), e8.increment("zzz").encode())
+            self.assertEqual(e8.increment_bytes(b""), e8.increment("").encode())
+            self.assertTrue(e8.check_bytes(bytearray(b"b222")))
+            self.assertRaises(ValueError, e8.check_bytes, b"2b")
+            self.assertRaises(ValueError, e8.decode_int_bytes, memoryview(b"b1"))
+
+    def test_immutable_shared(self):
+        e8 = Erdi8.get(safe=True)
+        self.assertIs(e8, Erdi8.get(True))
+        self.assertIsNot(e8, Erdi8.get())
+        self.assertEqual(e8.alph, Erdi8(safe=True).alph)
+        self.assertIs(e8.alph_map, Erdi8(safe=True).alph_map)
+        self.assertRaises(AttributeError, setattr, e8, "alph", "abc")
+        self.assertRaises(AttributeError, setattr, e8, "anything", 1)
+        self.assertRaises(AttributeError, delattr, e8, "alph")
+        self.assertFalse(hasattr(e8, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(e8)).encode_int(6545185), e8.encode_int(6545185))
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(Erdi8.get(safe=True))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result is e8 for result in results))
+
+    def test_subclass_alphabet(self):
+        class Hex(Erdi8):
+            ALPHABET = "0123456789abcdef"
+            OFFSET = 1
+
+        hex8 = Hex.get()
+        self.assertIsInstance(hex8, Hex)
+        self.assertIsNot(hex8, Erdi8.get())
+        self.assertEqual(hex8.alph, "0123456789abcdef")
+        for value in (0, 1, 15, 16, 255, 2**70):
+            self.assertEqual(hex8.decode_int(hex8.encode_int(value)), value)
+        self.assertRaises(ValueError, hex8.check, "0a")
+
+        class Octal(Erdi8):
+            alph = "01234567"
+            OFFSET = 1
+
+        self.assertEqual(Erdi8.alph, Erdi8.ALPHABET)
+        self.assertEqual((Octal.alph, Octal.ALPHABET), ("01234567", "01234567"))
+        self.assertEqual(Octal().alph, "01234567")
+        self.assertEqual(Octal().encode_int(8), "11")
+        self.assertEqual(Octal(safe=True).alph, "01234567")
@@ -0,0 +1,147 @@
+import unittest
+import datetime
+import math
+import random
+from erdi8 import Erdi8, FancySequence, FancyView, ShardRouter, StridePlanner
+
+
+class FancyTest(unittest.TestCase):
+    def test_sequence_matches_increment_fancy(self):
+        for flag, start in ((False, "erd"), (True, "b222222222"), (True, "fmzz7cwc43")):
+            e8 = Erdi8(flag)
+            stride = random.randint(0, 100000000000000000000000)
+            seq = FancySequence(e8, start, stride)
+            current = start
+            expected = []
+            for _ in range(1000):
+                current = e8.increment_fancy(current, stride)
+                expected.append(current)
+            self.assertEqual(seq.next_n(500), expected[:500])
+            self.assertEqual([next(seq) for _ in range(500)], expected[500:])
+            self.assertEqual(seq.current, expected[-1])
+            seq = FancySequence(e8, start, stride)
+            seq.skip(777)
+            self.assertEqual(seq.current, expected[776])
+
+    def test_sequence_full_tour(self):
+        e8 = Erdi8(safe=True)
+        seq = FancySequence(e8, "rd8", random.randint(0, 100000000000000000000000))
+        values = seq.next_n(20 * 28 * 28)
+        self.assertEqual(len(set(values)), 20 * 28 * 28)
+        self.assertEqual(values[-1], "rd8")
+
+    def test_sequence_invalid(self):
+        e8 = Erdi8()
+        self.assertRaises(ValueError, FancySequence, e8, "2ab", 1)
+        self.assertRaises(ValueError, FancySequence, e8, "", 1)
+
+    def test_view(self):
+        for flag, start in ((False, "erd"), (True, "b222222222")):
+            e8 = Erdi8(flag)
+            stride = random.randint(0, 100000000000000000000000)
+            view = FancyView(e8, start, stride)
+            expected = [start]
+            for _ in range(300):
+                expected.append(e8.increment_fancy(expected[-1], stride))
+            self.assertEqual([view[i] for i in range(301)], expected)
+            self.assertEqual(list(view[3:200:7]), expected[3:200:7])
+            self.assertEqual(list(view[100:2:-3]), expected[100:2:-3])
+            self.assertEqual([view.index(value) for value in expected], list(range(301)))
+            self.assertEqual(e8.increment_fancy(view[-1], stride), start)
+            self.assertEqual(len(view), e8.mod_space(len(start))[2])
+            self.assertIn("z" * len(start), view)
+            self.assertNotIn("2" * len(start), view)
+            self.assertNotIn(start[:-1], view)
+            self.assertRaises(IndexError, view.__getitem__, len(view))
+            self.assertRaises(ValueError, view.index, expected[10], 11, 20)
+
+    def test_view_full_tour(self):
+        e8 = Erdi8(safe=True)
+        view = FancyView(e8, "rd8", random.randint(0, 100000000000000000000000))
+        self.assertEqual(len(set(view)), len(view))
+        self.assertEqual(list(view), list(view[:]))
+
+    def test_router_matches_fancy_split_index(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            stride = random.randint(0, 100000000000000000000000)
+            router = ShardRouter(e8, 8, stride, 7)
+            self.assertEqual(router.starts(), e8.split_fancy_space(8, stride, 7))
+            mini, maxi, _ = e8.mod_space(8)
+            ids = [e8.encode_int(random.randint(mini, maxi)) for _ in range(500)]
+            # fancy_split_index puts the remainder of the space into an extra chunk
+            expected = [min(e8.fancy_split_index(i, stride, 7), 6) for i in ids]
+            self.assertEqual(router.route_many(ids), expected)
+            self.assertEqual([router.route(i) for i in ids], expected)
+
+    def test_router_split_merge(self):
+        e8 = Erdi8()
+        router = ShardRouter(e8, 3, 1234567, 4)
+        before = router.starts()
+        sizes = router.sizes()
+        router.split(1)
+        self.assertEqual(len(router), 5)
+        self.assertEqual(sum(router.sizes()), router.space)
+        self.assertEqual(router.sizes()[1:3], [sizes[1] // 2, sizes[1] - sizes[1] // 2])
+        self.assertEqual(router.route(router.starts()[2]), 2)
+        self.assertEqual(router.route(before[2]), 3)
+        router.merge(1)
+        self.assertEqual(router.starts(), before)
+        self.assertRaises(ValueError, router.merge, 3)
+        self.assertRaises(ValueError, router.split, -1)
+        self.assertRaises(ValueError, router.split, 4)
+        self.assertRaises(ValueError, ShardRouter, e8, 3, 1234567, 0)
+        self.assertRaises(ValueError, ShardRouter, e8, 1, 1234567, router.space)
+        self.assertEqual(len(ShardRouter(e8, 1, 7, e8.mod_space(1)[2])), e8.mod_space(1)[2])
+        self.assertRaises(ValueError, router.route, "22")
+
+    def test_planner(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            for length in (1, 2, 3, 10):
+                planner = StridePlanner(e8, length)
+                mini, space = planner.mini, planner.space
+                valid = [s for s in range(-100, 1000) if math.gcd(mini + s, space) == 1]
+                self.assertEqual(list(planner.valid(-100, 1000)), valid)
+                for stride in range(-50, 900, 7):
+                    self.assertEqual(
+                        planner.next_valid(stride), e8.effective_stride(mini, space, stride)
+                    )
+                    self.assertEqual(
+                        planner.previous_valid(stride), max(s for s in valid if s <= stride)
+                    )
+            planner = StridePlanner(e8, 16)
+            stride = planner.suggest()
+            self.assertTrue(planner.is_valid(stride))
+            self.assertLess(planner.score(stride), planner.score(30321718760514))
+            ranked = planner.rank(0, 500, 5)
+            self.assertEqual(len(ranked), 5)
+            self.assertEqual(ranked, sorted(ranked, key=planner.score))
+
+    def test_capacity(self):
+        e8 = Erdi8(safe=True)
+        stride = random.randint(0, 100000000000000000000000)
+        now = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+        view = FancyView(e8, "b222222222", stride)
+        current = "b222222222"
+        for _ in range(99):
+            current = e8.increment_fancy(current, stride)
+        capacity = view.capacity(current, rate=10**6, now=now)
+        self.assertEqual(capacity["issued"], 100)
+        self.assertEqual(capacity["remaining"], view.size - 100)
+        self.assertEqual(
+            capacity["exhausted_at"], now + datetime.timedelta(seconds=(view.size - 100) / 10**6)
+        )
+        self.assertIsNone(view.capacity(current)["exhausted_at"])
+        self.assertEqual(view.capacity(view[-1])["remaining"], 0)
+        self.assertIsNone(view.capacity(current, rate=1e-300)["exhausted_at"])
+        router = ShardRouter(e8, 10, stride, 6)
+        for index, start in enumerate(router.starts()):
+            current = start
+            for _ in range(9):
+                current = e8.increment_fancy(current, stride)
+            capacity = router.capacity(index, current)
+            self.assertEqual(capacity["issued"], 10)
+            self.assertEqual(capacity["total"], router.sizes()[index])
+            self.assertEqual(capacity["remaining"], router.sizes()[index] - 10)
+        self.assertRaises(ValueError, router.capacity, 0, router.starts()[1])
@@ -0,0 +1,38 @@
+import json
+import unittest
+from erdi8 import Erdi8
+from erdi8.metrics import Instrumentation
+
+
+class MetricsTest(unittest.TestCase):
+    def test_disabled_by_default(self):
+        original = Erdi8.encode_int
+        with Instrumentation() as metrics:
+            self.assertIsNot(Erdi8.encode_int, original)
+            self.assertTrue(metrics.enabled)
+            self.assertRaises(ValueError, Instrumentation().enable)
+        self.assertIs(Erdi8.encode_int, original)
+        self.assertFalse(metrics.enabled)
+        Erdi8().encode_int(10)
+        self.assertEqual(metrics.snapshot()["methods"], {})
+
+    def test_snapshot(self):
+        e8 = Erdi8()
+        with Instrumentation() as metrics:
+            for i in range(10):
+                e8.encode_int(i)
+            self.assertRaises(ValueError, e8.decode_int, "2ab")
+            self.assertEqual(e8.validate_many(["2a", "ab", "a!"]), [False, True, False])
+            e8.validate("ab")
+            # mini + stride = 850 + 5 shares the factor 5 with the space size 27225
+            e8.increment_fancy("erd", 5)
+        snapshot = metrics.snapshot()
+        json.dumps(snapshot)
+        encode = snapshot["methods"]["encode_int"]
+        self.assertEqual(encode["calls"], 11)
+        self.assertEqual(sum(encode["histogram"].values()), 11)
+        self.assertGreater(encode["time"], 0)
+        self.assertEqual(snapshot["methods"]["mod_space"]["calls"], 1)
+        self.assertEqual(snapshot["counters"], {"gcd_iterations": 1, "check_failures": 3})
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["counters"]["check_failures"], 0)
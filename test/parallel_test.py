@@ -0,0 +1,42 @@
+import os
+import unittest
+from erdi8 import Erdi8
+from erdi8.parallel import decode_parallel, encode_parallel
+
+
+class ParallelTest(unittest.TestCase):
+    def test_round_trip(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            data = os.urandom(16 * 1000)
+            values = encode_parallel(e8, data, 16, workers=2, chunk_size=300, min_records=0)
+            self.assertEqual(values, e8.encode_many(data, record_size=16))
+            back = decode_parallel(e8, values, 16, workers=2, chunk_size=300, min_records=0)
+            self.assertEqual(back, data)
+
+    def test_width(self):
+        e8 = Erdi8()
+        data = os.urandom(32 * 100)
+        values = encode_parallel(e8, data, 32, width=60, workers=2, chunk_size=7, min_records=0)
+        self.assertEqual(values, e8.encode_many(data, record_size=32, width=60))
+        back = decode_parallel(e8, values, 32, width=60, workers=2, chunk_size=7, min_records=0)
+        self.assertEqual(back, data)
+
+    def test_in_process(self):
+        e8 = Erdi8()
+        data = bytes([0, 0, 0, 25, 0, 99, 223, 33])
+        self.assertEqual(encode_parallel(e8, data, 4), ["a2", "erdi8"])
+        self.assertEqual(decode_parallel(e8, ["a2", "erdi8"], 4), data)
+        self.assertEqual(encode_parallel(e8, b"", 4, workers=2, min_records=0), [])
+        self.assertEqual(decode_parallel(e8, [], 4, workers=2, min_records=0), b"")
+
+    def test_invalid(self):
+        e8 = Erdi8()
+        self.assertRaises(ValueError, encode_parallel, e8, b"12345", 4)
+        for min_records in (0, 100):
+            self.assertRaises(
+                ValueError, decode_parallel, e8, ["a2", "2a"], 4, workers=2, min_records=min_records
+            )
+            self.assertRaises(
+                ValueError, decode_parallel, e8, ["zzzzzzzzz"], 4, workers=2, min_records=min_records
+            )
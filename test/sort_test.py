@@ -0,0 +1,91 @@
+import unittest
+import os
+import random
+import tempfile
+from erdi8 import Erdi8, FancyView
+from erdi8.sort import audit, numeric_key, sort_file, sort_numeric
+
+
+class SortTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "ids.txt")
+        self.target = os.path.join(self.directory.name, "sorted.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, values):
+        with open(self.source, "w") as f:
+            f.write("\n".join(values) + "\n")
+
+    def _read(self):
+        with open(self.target) as f:
+            return f.read().split()
+
+    def test_numeric_order(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            ints = [random.getrandbits(random.randint(1, 80)) for _ in range(2000)]
+            values = e8.encode_many(ints)
+            expected = e8.encode_many(sorted(ints))
+            self.assertEqual(sorted(values, key=numeric_key), expected)
+            sort_numeric(values)
+            self.assertEqual(values, expected)
+
+    def test_sort_file(self):
+        e8 = Erdi8()
+        ints = [random.randint(0, 10**9) for _ in range(5000)]
+        ints = ints + ints[:700]
+        random.shuffle(ints)
+        self._write(e8.encode_many(ints))
+        count = sort_file(self.source, self.target, chunk_lines=300, fan_in=3)
+        self.assertEqual(count, len(ints))
+        self.assertEqual(self._read(), e8.encode_many(sorted(ints)))
+        count = sort_file(
+            self.source, self.source, deduplicate=True, chunk_lines=256, tmp_dir=self.directory.name
+        )
+        self.assertEqual(count, len(set(ints)))
+        with open(self.source) as f:
+            self.assertEqual(f.read().split(), e8.encode_many(sorted(set(ints))))
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["ids.txt", "sorted.txt"])
+
+    def test_audit_plain(self):
+        e8 = Erdi8()
+        values = e8.encode_many(list(range(100, 200)) + [150, 150, 160] + list(range(205, 210)))
+        self._write(values[::-1])
+        sort_file(self.source, self.target)
+        result = audit(self._read(), e8, start=e8.encode_int(98), last=e8.encode_int(211))
+        self.assertEqual(result["count"], len(values))
+        self.assertEqual(result["duplicates"], 3)
+        self.assertEqual(result["duplicated"], e8.encode_many([150, 160]))
+        self.assertEqual(result["missing"], 2 + 5 + 2)
+        self.assertEqual(
+            result["gaps"],
+            [
+                (e8.encode_int(98), e8.encode_int(99)),
+                (e8.encode_int(200), e8.encode_int(204)),
+                (e8.encode_int(210), e8.encode_int(211)),
+            ],
+        )
+        self.assertEqual(audit(e8.encode_many(range(0, 50)), e8)["missing"], 0)
+        self.assertRaises(ValueError, audit, e8.encode_many([5, 3]), e8)
+
+    def test_audit_fancy(self):
+        e8 = Erdi8(safe=True)
+        stride = random.randint(0, 10**20)
+        view = FancyView(e8, "b222222", stride)
+        issued = list(view[:1000])
+        logged = issued[:400] + issued[410:] + issued[20:25]
+        random.shuffle(logged)
+        self._write(logged)
+        sort_file(self.source, self.target, key=view.index, chunk_lines=200)
+        result = audit(self._read(), e8, "b222222", stride, last=view[1001], limit=1)
+        self.assertEqual(result["count"], len(logged))
+        self.assertEqual((result["missing"], result["duplicates"]), (10 + 2, 5))
+        self.assertEqual(result["gaps"], [(view[400], view[409])])
+        self.assertEqual(result["duplicated"], [view[20]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import random
+import stat
+import tempfile
+from unittest import mock
+from erdi8 import Erdi8
+from erdi8.store import PersistentCounter, RECORD_HEADER, RECORD_SIZE
+
+
+class StoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "counter.e8")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_plain_matches_increment(self):
+        e8 = Erdi8()
+        with PersistentCounter(self.path, batch_size=10) as counter:
+            issued = counter.next_n(25) + [next(counter)]
+            self.assertEqual(counter.current, issued[-1])
+        current = None
+        for value in issued:
+            current = e8.increment(current)
+            self.assertEqual(value, current)
+
+    def test_fancy_matches_increment_fancy(self):
+        e8 = Erdi8(safe=True)
+        stride = random.randint(0, 100000000000000000000000)
+        with PersistentCounter(self.path, "b222222222", stride, safe=True) as counter:
+            issued = [next(counter) for _ in range(100)]
+        current = "b222222222"
+        for value in issued:
+            current = e8.increment_fancy(current, stride)
+            self.assertEqual(value, current)
+
+    def test_restart_skips_reserved(self):
+        stride = random.randint(0, 100000000000000000000000)
+        counter = PersistentCounter(self.path, "erd", stride, batch_size=100)
+        issued = counter.next_n(50) + counter.next_n(50) + counter.next_n(50)
+        # simulate a crash: the state file is never closed properly
+        counter._map.close()
+        os.close(counter._fd)
+        counter._fd = -1
+        with PersistentCounter(self.path, batch_size=100) as counter:
+            self.assertEqual(counter.issued, 200)
+            later = counter.next_n(1000)
+        self.assertFalse(set(issued) & set(later))
+        with PersistentCounter(self.path, "erd", stride) as counter:
+            self.assertEqual(counter.issued, 1200)
+
+    def test_torn_write(self):
+        with PersistentCounter(self.path, batch_size=10) as counter:
+            counter.next_n(5)
+            counter.next_n(10)
+        # corrupt the newest record, the older one (reserved=10) is used instead
+        with open(self.path, "r+b") as f:
+            f.seek(RECORD_SIZE + 30)
+            f.write(b"garbage")
+        with PersistentCounter(self.path, batch_size=10) as counter:
+            self.assertEqual(counter.issued, 10)
+
+    def test_no_valid_record(self):
+        with PersistentCounter(self.path, batch_size=10) as counter:
+            counter.next_n(5)
+            counter.next_n(10)
+        # both records are corrupt, starting over would issue "a" to "e" again
+        with open(self.path, "r+b") as f:
+            for offset in (30, RECORD_SIZE + 30):
+                f.seek(offset)
+                f.write(b"x")
+        self.assertRaises(ValueError, PersistentCounter, self.path)
+        # a torn header (here: the sequence number) doesn't pass the checksum either
+        with open(self.path, "wb") as f:
+            f.truncate(0)
+        PersistentCounter(self.path).close()
+        with open(self.path, "r+b") as f:
+            f.seek(RECORD_SIZE + 8)
+            f.write(b"\xff")
+            f.seek(8)
+            f.write(b"\xff")
+        self.assertRaises(ValueError, PersistentCounter, self.path)
+
+    def test_payload_too_large(self):
+        start = "b" + "2" * 2100
+        self.assertRaises(ValueError, PersistentCounter, self.path, start)
+        limit = RECORD_SIZE - RECORD_HEADER.size
+        self.assertRaises(ValueError, PersistentCounter, self.path, "b" * (limit - 60), 7)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read().strip(b"\0"), b"")
+
+    def test_directory_synced(self):
+        synced = []
+        fsync = os.fsync
+
+        def record(fd):
+            synced.append(stat.S_ISDIR(os.fstat(fd).st_mode))
+            fsync(fd)
+
+        with mock.patch("erdi8.store.os.fsync", record):
+            PersistentCounter(self.path).close()
+            self.assertIn(True, synced)
+            synced.clear()
+            PersistentCounter(self.path).close()
+            self.assertEqual(synced, [])
+
+    def test_mismatch(self):
+        PersistentCounter(self.path, "erd", 5).close()
+        self.assertRaises(ValueError, PersistentCounter, self.path, "erd", 6)
+        self.assertRaises(ValueError, PersistentCounter, self.path, safe=True)
@@ -0,0 +1,52 @@
+import unittest
+import io
+import os
+import random
+from erdi8 import Erdi8
+from erdi8.stream import iter_encode, iter_decode, encode_stream, decode_stream
+
+
+class StreamTest(unittest.TestCase):
+    def test_round_trip(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            for size in (0, 1, 2, 3, 4, 5, 11, random.randint(100, 10000)):
+                data = os.urandom(size)
+                encoded = "".join(iter_encode(e8, data, block_size=random.randint(1, 64)))
+                self.assertEqual(len(encoded), 7 * ((size + 3) // 4))
+                decoded = b"".join(
+                    iter_decode(e8, encoded, block_size=random.randint(1, 64))
+                )
+                self.assertEqual(decoded, data)
+
+    def test_compatible_with_four_bytes(self):
+        for flag in (False, True):
+            e8 = Erdi8(flag)
+            data = os.urandom(400)
+            expected = "".join(
+                e8.encode_four_bytes(data[i : i + 4]) for i in range(0, 400, 4)
+            )
+            self.assertEqual("".join(iter_encode(e8, memoryview(data))), expected)
+
+    def test_file_objects(self):
+        e8 = Erdi8(safe=True)
+        data = os.urandom(12345)
+        text = io.StringIO()
+        encode_stream(e8, io.BufferedReader(io.BytesIO(data)), text, block_size=1000)
+        binary = io.BytesIO()
+        encode_stream(e8, io.BytesIO(data), binary, block_size=1000)
+        self.assertEqual(binary.getvalue().decode("ascii"), text.getvalue())
+        out = io.BytesIO()
+        written = decode_stream(e8, io.StringIO(text.getvalue() + "\n"), out, block_size=99)
+        self.assertEqual(written, len(data))
+        self.assertEqual(out.getvalue(), data)
+
+    def test_invalid(self):
+        e8 = Erdi8()
+        for invalid in ("2aaaaaa", "aaaaaal", "abc", "zzzzzzz", "a2222222222222"):
+            with self.assertRaises(ValueError):
+                b"".join(iter_decode(e8, invalid))
+        # a partial chunk may only appear at the end
+        partial = "".join(iter_encode(e8, b"ab"))
+        with self.assertRaises(ValueError):
+            b"".join(iter_decode(e8, partial + partial))